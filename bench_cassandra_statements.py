@@ -0,0 +1,117 @@
+"""Per-operation latency of simple-string CQL versus prepared statements.
+
+Runs against the local Cassandra container from "Docker Commands.txt" in a scratch
+keyspace that is dropped afterwards:
+
+    python bench_cassandra_statements.py --host 127.0.0.1 --ops 2000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date
+
+from cassandra.cluster import Cluster
+
+from cassandra_statements import STUDENT_QUERIES, StatementRegistry, student_values, update_values
+
+
+KEYSPACE = 'student_management_bench'
+
+# The statements timed; the scratch keyspace only has the students table they need
+BENCH_QUERIES = ('insert_student', 'select_student', 'update_student', 'delete_student')
+
+
+
+def make_record(i):
+    return {
+        'id': i,
+        'name': f'Student {i}',
+        'email': f'student{i}@example.com',
+        'phone_no': '9876543210',
+        'gender': 'Male',
+        'dob': date(2000, 1, 1 + i % 28).isoformat(),
+        'stream': 'Science',
+    }
+
+
+
+def simple_ops(session):
+    # The statements the GUIs sent before the statement registry
+    return {
+        'insert': lambda r: session.execute(
+            "INSERT INTO students (id, name, email, phone_no, gender, dob, stream) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            (r['id'], r['name'], r['email'], r['phone_no'], r['gender'], r['dob'], r['stream'])),
+        'select': lambda r: session.execute(f"SELECT * FROM students WHERE id={r['id']}").one(),
+        'update': lambda r: session.execute(
+            "UPDATE students SET name=%s, email=%s, phone_no=%s, gender=%s, dob=%s, stream=%s WHERE id=%s",
+            (r['name'], r['email'], r['phone_no'], r['gender'], r['dob'], r['stream'], r['id'])),
+        'delete': lambda r: session.execute(f"DELETE FROM students WHERE id={r['id']}"),
+    }
+
+
+
+def prepared_ops(statements):
+    return {
+        'insert': lambda r: statements.execute('insert_student', student_values(r)),
+        'select': lambda r: statements.execute('select_student', (r['id'],)).one(),
+        'update': lambda r: statements.execute('update_student', update_values(r)),
+        'delete': lambda r: statements.execute('delete_student', (r['id'],)),
+    }
+
+
+
+def run(ops, records):
+    timings = {}
+    for name, op in ops.items():
+        samples = []
+        for record in records:
+            start = time.perf_counter()
+            op(record)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = samples
+    return timings
+
+
+
+def report(label, timings):
+    for name, samples in timings.items():
+        samples = sorted(samples)
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        print(f"{label:<9} {name:<7} mean {statistics.mean(samples):7.3f} ms   "
+              f"p50 {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9042)
+    parser.add_argument('--ops', type=int, default=1000, help='operations per statement type')
+    args = parser.parse_args()
+
+    cluster = Cluster(contact_points=[args.host], port=args.port)
+    session = cluster.connect()
+    session.execute(f"CREATE KEYSPACE IF NOT EXISTS {KEYSPACE} WITH replication = {{'class': 'SimpleStrategy', 'replication_factor': '1'}}")
+    session.set_keyspace(KEYSPACE)
+    session.execute("CREATE TABLE IF NOT EXISTS students (id int PRIMARY KEY, name text, email text, phone_no text, gender text, dob date, stream text)")
+
+    try:
+        records = [make_record(i) for i in range(1, args.ops + 1)]
+        statements = StatementRegistry(session, {name: STUDENT_QUERIES[name] for name in BENCH_QUERIES})
+        statements.prepare_all()
+
+        # Warm up connections and the server's statement cache before measuring
+        run(simple_ops(session), records[:50])
+        run(prepared_ops(statements), records[:50])
+
+        report('simple', run(simple_ops(session), records))
+        report('prepared', run(prepared_ops(statements), records))
+    finally:
+        session.execute(f"DROP KEYSPACE IF EXISTS {KEYSPACE}")
+        cluster.shutdown()
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Import time of the launcher, the window and each backend, each in a fresh interpreter.
+
+The launcher imports a backend's driver only once that backend is chosen, so a run
+never pays for the other driver. Needs no database:
+
+    python bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+# What a start of each kind imports, in order
+SCENARIOS = {
+    'launcher': ['student_management'],
+    'mongodb window': ['student_management', 'mongo_backend', 'student_window'],
+    'cassandra window': ['student_management', 'cassandra_backend', 'student_window'],
+    'mongodb headless': ['student_management', 'mongo_backend', 'student_import', 'student_export'],
+    'cassandra headless': ['student_management', 'cassandra_backend', 'student_import', 'student_export'],
+}
+
+# Heavy packages reported as loaded or not after each scenario
+PACKAGES = ['pymongo', 'cassandra', 'PyQt5.QtCore', 'PyQt5.QtWidgets']
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for module in sys.argv[1:]:
+    importlib.import_module(module)
+print(json.dumps({'seconds': time.perf_counter() - start,
+                  'loaded': [p for p in %r if p in sys.modules]}))
+""" % (PACKAGES,)
+
+
+
+def measure(modules):
+    out = subprocess.run([sys.executable, '-c', PROBE] + modules, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per scenario')
+    args = parser.parse_args()
+
+    for name, modules in SCENARIOS.items():
+        samples = [measure(modules) for _ in range(args.runs)]
+        times = [sample['seconds'] * 1000 for sample in samples]
+        loaded = ", ".join(samples[0]['loaded']) or "none"
+        print(f"{name:<19} median {statistics.median(times):7.1f} ms   min {min(times):7.1f} ms   drivers/Qt loaded: {loaded}")
+
+
+
+if __name__ == '__main__':
+    main()
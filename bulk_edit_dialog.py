@@ -0,0 +1,61 @@
+from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtWidgets import (QDialog, QGridLayout, QLabel, QCheckBox, QLineEdit, QComboBox, QDateEdit,
+                             QRadioButton, QDialogButtonBox)
+
+
+# Fields that can be set on many students at once; name, email and phone stay per student
+BULK_FIELDS = ('stream', 'gender', 'dob')
+
+
+
+class BulkEditDialog(QDialog):
+    """Asks which fields to set, to what, and whether on the selected rows or on every filtered row."""
+
+    def __init__(self, selected_count, filter_description, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Bulk Update")
+        layout = QGridLayout(self)
+
+        self.scope_selected = QRadioButton(f"Selected rows ({selected_count})")
+        self.scope_selected.setEnabled(selected_count > 0)
+        self.scope_filtered = QRadioButton(f"Every student matching the filter ({filter_description})")
+        (self.scope_selected if selected_count else self.scope_filtered).setChecked(True)
+        layout.addWidget(self.scope_selected, 0, 0, 1, 2)
+        layout.addWidget(self.scope_filtered, 1, 0, 1, 2)
+
+        layout.addWidget(QLabel("Set:"), 2, 0, 1, 2)
+        self.stream_entry = QLineEdit()
+        self.gender_entry = QComboBox()
+        self.gender_entry.addItems(["Male", "Female"])
+        self.dob_entry = QDateEdit(QDate.currentDate())
+        self.dob_entry.setDisplayFormat("yyyy-MM-dd")
+
+        self.checks = {}
+        for row, (field, label, editor) in enumerate((('stream', "Stream", self.stream_entry),
+                                                      ('gender', "Gender", self.gender_entry),
+                                                      ('dob', "Date of Birth", self.dob_entry)), 3):
+            check = QCheckBox(label)
+            editor.setEnabled(False)
+            check.toggled.connect(editor.setEnabled)
+            self.checks[field] = check
+            layout.addWidget(check, row, 0)
+            layout.addWidget(editor, row, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons, 6, 0, 1, 2)
+
+
+    def use_selection(self):
+        return self.scope_selected.isChecked()
+
+
+    def changes(self):
+        """The checked fields and their new values, as record keys and strings."""
+        values = {
+            'stream': self.stream_entry.text().strip(),
+            'gender': self.gender_entry.currentText(),
+            'dob': self.dob_entry.date().toString(Qt.ISODate),
+        }
+        return {field: values[field] for field in BULK_FIELDS if self.checks[field].isChecked()}
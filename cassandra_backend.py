@@ -0,0 +1,340 @@
+import json
+import os
+from itertools import islice
+
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster
+from cassandra.cluster import NoHostAvailable
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+
+from student_import import CassandraStudentWriter
+from student_export import EXPORT_BATCH_SIZE
+from student_filters import SEARCH_TIMEOUT_MS
+from cassandra_statements import StatementRegistry, row_to_record
+from cassandra_token_scan import TokenRangeScanner
+from cassandra_migrations import CASSANDRA_MIGRATIONS, migrate_keyspace
+from cassandra_email_lookup import claim_email, release_email, backfill_email_lookup
+from cassandra_name_lookup import student_insert_batch, student_changes_batch, student_delete_batch, backfill_name_lookup
+from id_sequence import id_block_size, CassandraIdSequence
+from driver_settings import CassandraDriverSettings
+from student_validation import RecordError
+from latency_metrics import OperationMetrics, TimedRows, TimedWriter, timed
+from slow_operations import slow_operation_log
+from cassandra_monitoring import CassandraRequestMonitor
+
+
+# Requests kept in flight at once by bulk operations
+BULK_CONCURRENCY = 100
+
+
+
+def connect_local_cluster(settings):
+    cluster = Cluster(contact_points=['127.0.0.1'], port=9042, **settings.cluster_options())
+    settings.apply(cluster)
+    session = cluster.connect()
+
+    # An existing keyspace is found in the driver's schema metadata, without a round trip
+    if 'student_management' not in session.cluster.metadata.keyspaces:
+        session.execute("CREATE KEYSPACE IF NOT EXISTS student_management WITH replication = {'class': 'SimpleStrategy', 'replication_factor': '1'}")
+    session.set_keyspace('student_management')
+    return cluster, session
+
+
+
+def connect_astra_cluster(settings):
+    # Set ASTRA_DB_SECURE_BUNDLE_PATH and ASTRA_DB_APPLICATION_TOKEN in .env to your AstraDB
+    # secure connect bundle and application token file; the keyspace is created in the Astra console
+    cloud_config = {
+        'secure_connect_bundle': os.getenv("ASTRA_DB_SECURE_BUNDLE_PATH")
+    }
+
+    with open(os.getenv("ASTRA_DB_APPLICATION_TOKEN")) as f:
+        secrets = json.load(f)
+
+    auth_provider = PlainTextAuthProvider(secrets["clientId"], secrets["secret"])
+    cluster = Cluster(cloud=cloud_config, auth_provider=auth_provider, **settings.cluster_options())
+    settings.apply(cluster)
+    session = cluster.connect()
+    session.set_keyspace('student_management')
+    return cluster, session
+
+
+
+class CassandraBackend:
+    """Student storage in the student_management keyspace of a Cassandra cluster.
+
+    Every method except open() and start() needs a started backend. The window
+    calls them on worker threads, so none of them touches Qt. Each database
+    operation's latency is recorded in metrics under the backend's name, and
+    the driver's slow or failed requests in slow_operations.
+    """
+
+    migrations = CASSANDRA_MIGRATIONS
+
+    # Filtered pages follow the filter query's own order, which has no id to start from
+    jump_within_filter = False
+
+    def __init__(self, name, connect_cluster, description, settings):
+        self.name = name
+        self.connect_cluster = connect_cluster
+        self.description = description
+        self.settings = settings
+        # Read here, with the driver settings, so a bad value stops the launcher
+        self.id_block_size = id_block_size()
+        self.metrics = OperationMetrics()
+        self.slow_operations = slow_operation_log()
+        self.cluster = None
+
+
+    def open(self):
+        try:
+            self.cluster, self.session = self.connect_cluster(self.settings)
+            CassandraRequestMonitor(self.slow_operations, self.name, self.settings.trace_percent).attach(self.session)
+            print("Connected to %s" % self.description)
+        except NoHostAvailable as e:
+            print("Could not connect to %s: %s" % (self.description, e))
+            raise
+
+
+    @timed('migrate')
+    def migrate(self):
+        return migrate_keyspace(self.session)
+
+
+    def setup_schema(self):
+        # Tables and indexes are only created when the schema version recorded in the keyspace is behind
+        try:
+            self.migrate()
+        except Exception as e:
+            print("Schema migration failed, fix the cause and run with --migrate: %s" % e)
+
+
+    @timed('connect')
+    def start(self):
+        self.open()
+        try:
+            self.setup_schema()
+
+            # Prepare every query once; each operation then only binds its parameters
+            self.statements = StatementRegistry(self.session)
+            self.statements.prepare_all()
+        except Exception:
+            self.close()
+            raise
+
+        # Ids are handed out locally from blocks reserved in the id_sequences table
+        self.id_sequence = CassandraIdSequence(self.statements, block_size=self.id_block_size)
+
+        # Full-table reads are split into token ranges and read in parallel across the cluster
+        self.scanner = TokenRangeScanner(self.session, self.statements, self.settings.scan_splits, self.settings.scan_concurrency)
+
+
+    def close(self):
+        if self.cluster is not None:
+            self.cluster.shutdown()
+
+
+    def driver_settings(self):
+        return self.settings.effective(self.cluster)
+
+
+    def scroll_source(self, student_filter, batch_size):
+        if not student_filter.is_empty():
+            rows = self.filtered_records(student_filter, batch_size)
+        else:
+            # Token ranges are read in parallel and rows appear as they arrive; readers pause once
+            # a bounded buffer is full, so only about as much as the user scrolls to is fetched
+            rows = self.scanner.scan()
+        return TimedRows(rows, self.metrics, self.name, 'scroll_batch', batch_size)
+
+
+    def filtered_records(self, student_filter, batch_size):
+        # Runs on the worker reading the model's first batch; the driver pages through the result
+        cql, params, residual = student_filter.cassandra_query()
+        for row in self.statements.execute_cql(cql, params, fetch_size=batch_size, timeout=SEARCH_TIMEOUT_MS / 1000):
+            record = row_to_record(row)
+            if residual is None or residual.matches(record):
+                yield record
+
+
+    def first_page_cursor(self):
+        return (None, None)  # (id the page query starts at, driver paging state)
+
+
+    def page_cursor_for_id(self, record_id):
+        # Rows are stored in token order, so the pages start at this id's token and continue in token order
+        return (record_id, None)
+
+
+    @timed('fetch_page')
+    def fetch_page(self, student_filter, cursor, page_size):
+        start_id, paging_state = cursor
+        residual = None
+        if not student_filter.is_empty():
+            # Filtered pages follow the filter query's own order, so they always start at its first row
+            cql, params, residual = student_filter.cassandra_query()
+            rows = self.statements.execute_cql(cql, params, fetch_size=page_size, paging_state=paging_state,
+                                               timeout=SEARCH_TIMEOUT_MS / 1000)
+        elif start_id is None:
+            rows = self.statements.execute('select_page', fetch_size=page_size, paging_state=paging_state)
+        else:
+            rows = self.statements.execute('select_page_from_id', (start_id,), fetch_size=page_size, paging_state=paging_state)
+        # Only the first page of the result is read; its paging state resumes the query for the next page
+        records = [row_to_record(row) for row in rows.current_rows]
+        if residual is not None:
+            # A name prefix page may come back short once the other criteria are applied
+            records = [record for record in records if residual.matches(record)]
+        next_cursor = (start_id, rows.paging_state) if rows.has_more_pages else None
+        return records, next_cursor
+
+
+    @timed('explain')
+    def explain_filter(self, student_filter, page_size):
+        if student_filter.is_empty():
+            return (f"Scrolling: parallel scan of {self.scanner.splits} token ranges of students\n"
+                    f"Paged view: {self.statements.queries['select_page']} (driver paging)")
+        return student_filter.describe_cassandra_plan()
+
+
+    @timed('insert')
+    def insert_record(self, new_record):
+        record = {'id': self.id_sequence.next_id(), **new_record}
+
+        # Claim the email first; the lightweight transaction fails if another student already has it
+        if not claim_email(self.statements, record['email'], record['id']):
+            raise RecordError("Email already exists! Please enter a unique email.")
+
+        # Insert the new record into the collection
+        try:
+            self.session.execute(student_insert_batch(self.statements, record))
+        except Exception:
+            release_email(self.statements, record['email'], record['id'])
+            raise
+        return record
+
+
+    @timed('delete')
+    def delete_records(self, record_ids):
+        # Read the rows first: their names and emails locate the students_by_name and students_by_email entries
+        reads = execute_concurrent_with_args(self.session, self.statements.get('select_student'),
+                                             [(record_id,) for record_id in record_ids], concurrency=BULK_CONCURRENCY)
+        rows = [row for row in (result.one() for _, result in reads) if row is not None]
+        if not rows:
+            raise RecordError('No record found with the provided ID.')
+
+        # Each student is its own partition, so its rows are deleted by one batch and the batches run concurrently
+        deletes = execute_concurrent(self.session, [(student_delete_batch(self.statements, row.id, row.name), None) for row in rows],
+                                     concurrency=BULK_CONCURRENCY, raise_on_first_error=False)
+        deleted = [row for row, (success, _) in zip(rows, deletes) if success]
+        # The emails of every deleted student are released, even when some other batch failed
+        execute_concurrent_with_args(self.session, self.statements.get('release_email'),
+                                     [(row.email, row.id) for row in deleted if row.email], concurrency=BULK_CONCURRENCY)
+        for success, result in deletes:
+            if not success:
+                raise result
+        return [row.id for row in deleted]
+
+
+    @timed('find')
+    def find_record(self, record_id):
+        row = self.statements.execute('select_student', (record_id,)).one()
+        return row_to_record(row) if row else None
+
+
+    @timed('update')
+    def save_record(self, original, changes):
+        # Read the stored row: UPDATE would otherwise recreate a deleted student, and its
+        # name and email locate the lookup entries to move
+        row = self.statements.execute('select_student', (original['id'],)).one()
+        if row is None:
+            raise RecordError('No record found with the provided ID.')
+        current = row_to_record(row)
+        changes = {field: value for field, value in changes.items() if current[field] != value}
+        if not changes:
+            return current
+
+        # Only a changed email is claimed; the old one is released once the update is in place
+        email_changed = 'email' in changes
+        if email_changed and not claim_email(self.statements, changes['email'], current['id']):
+            raise RecordError("Email already exists! Please enter a unique email.")
+
+        try:
+            self.session.execute(student_changes_batch(self.statements, current, changes))
+        except Exception:
+            if email_changed:
+                release_email(self.statements, changes['email'], current['id'])
+            raise
+        if email_changed and current['email']:
+            release_email(self.statements, current['email'], current['id'])
+        return {**current, **changes}
+
+
+    @timed('bulk_count')
+    def count_bulk_targets(self, record_ids, student_filter):
+        # Only counts: the rows are read again when the update is applied, so nothing stale is written back
+        target = (record_ids, student_filter)
+        return target, sum(1 for _ in self.bulk_targets(*target))
+
+
+    def bulk_targets(self, record_ids, student_filter):
+        """The current rows of the students a bulk update applies to, streamed."""
+        if record_ids is None:
+            return self.scanner.scan() if student_filter.is_empty() else self.filtered_records(student_filter, EXPORT_BATCH_SIZE)
+        return self.records_by_id(record_ids)
+
+
+    def records_by_id(self, record_ids):
+        for start in range(0, len(record_ids), EXPORT_BATCH_SIZE):
+            reads = execute_concurrent_with_args(self.session, self.statements.get('select_student'),
+                                                 [(record_id,) for record_id in record_ids[start:start + EXPORT_BATCH_SIZE]],
+                                                 concurrency=BULK_CONCURRENCY)
+            for _, result in reads:
+                row = result.one()
+                if row is not None:
+                    yield row_to_record(row)
+
+
+    @timed('bulk_update')
+    def apply_bulk_update(self, target, changes):
+        # The targets are re-read in chunks; each student gets one prepared UPDATE of the changed columns
+        # (in a batch rewriting its students_by_name copy), run concurrently
+        updated = 0
+        records = self.bulk_targets(*target)
+        while True:
+            chunk = list(islice(records, EXPORT_BATCH_SIZE))
+            if not chunk:
+                return updated
+            execute_concurrent(self.session, [(student_changes_batch(self.statements, record, changes), None) for record in chunk],
+                               concurrency=BULK_CONCURRENCY)
+            updated += len(chunk)
+
+
+    def student_writer(self):
+        return TimedWriter(CassandraStudentWriter(self.session, self.statements, self.id_sequence), self.metrics, self.name, 'import_batch')
+
+
+    def export_records(self):
+        # Token ranges are read in parallel; readers pause while the file writer catches up
+        rows = TokenRangeScanner(self.session, self.statements, self.settings.scan_splits, self.settings.scan_concurrency,
+                                 fetch_size=EXPORT_BATCH_SIZE).scan()
+        return TimedRows(rows, self.metrics, self.name, 'export_batch', EXPORT_BATCH_SIZE)
+
+
+    @timed('backfill_emails')
+    def backfill_emails(self):
+        return backfill_email_lookup(self.session)
+
+
+    @timed('backfill_names')
+    def backfill_names(self):
+        return backfill_name_lookup(self.session)
+
+
+
+def local_backend():
+    return CassandraBackend('cassandra', connect_local_cluster, "local Cassandra database", CassandraDriverSettings())
+
+
+
+def astra_backend():
+    return CassandraBackend('astra', connect_astra_cluster, "cloud DataStax Astra Cassandra database", CassandraDriverSettings())
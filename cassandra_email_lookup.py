@@ -0,0 +1,67 @@
+from cassandra.concurrent import execute_concurrent_with_args
+
+from cassandra_statements import StatementRegistry
+
+
+# students_by_email maps each email to the id of the student that owns it, so the
+# uniqueness check is a single-partition lightweight transaction instead of a
+# cluster-wide ALLOW FILTERING scan
+EMAIL_LOOKUP_TABLE = "CREATE TABLE IF NOT EXISTS students_by_email (email text PRIMARY KEY, id int)"
+
+
+
+def claim_email(statements, email, record_id):
+    """Atomically claim email for record_id. Returns False if another student owns it."""
+    result = statements.execute('claim_email', (email, record_id))
+    return result.was_applied or result.one().id == record_id
+
+
+
+def release_email(statements, email, record_id):
+    # Conditional so a claim that has since passed to another student is left alone
+    statements.execute('release_email', (email, record_id))
+
+
+
+def backfill_email_lookup(session, chunk_size=1000, concurrency=50):
+    """Claim the email of every existing student in students_by_email.
+
+    Reads the students table page by page and claims each chunk of emails
+    concurrently, so memory stays bounded by chunk_size. Returns the number of
+    emails claimed and a list of (id, email, owner_id) for duplicate emails already
+    present in the data, which have to be fixed by hand.
+    """
+    session.execute(EMAIL_LOOKUP_TABLE)
+    statements = StatementRegistry(session)
+    claim = statements.get('claim_email')
+
+    claimed = 0
+    conflicts = []
+    rows = statements.execute('select_all_emails', fetch_size=chunk_size)
+    chunk = []
+    for row in rows:
+        if row.email is None:
+            continue
+        chunk.append((row.email, row.id))
+        if len(chunk) == chunk_size:
+            claimed += _claim_chunk(session, claim, chunk, concurrency, conflicts)
+            chunk = []
+    if chunk:
+        claimed += _claim_chunk(session, claim, chunk, concurrency, conflicts)
+    return claimed, conflicts
+
+
+
+def _claim_chunk(session, claim, chunk, concurrency, conflicts):
+    claimed = 0
+    results = execute_concurrent_with_args(session, claim, chunk, concurrency=concurrency)
+    for (email, record_id), (success, result) in zip(chunk, results):
+        if not success:
+            raise result
+        if result.was_applied:
+            claimed += 1
+        else:
+            owner_id = result.one().id
+            if owner_id != record_id:
+                conflicts.append((record_id, email, owner_id))
+    return claimed
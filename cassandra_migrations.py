@@ -0,0 +1,53 @@
+from schema_migrations import SCHEMA_NAME, migrate
+from cassandra_email_lookup import EMAIL_LOOKUP_TABLE
+from cassandra_name_lookup import NAME_LOOKUP_TABLE, FILTER_INDEXES
+
+
+SCHEMA_MIGRATIONS_TABLE = "CREATE TABLE IF NOT EXISTS schema_migrations (name text PRIMARY KEY, version int)"
+
+
+
+def _execute_all(*statements):
+    def apply(session):
+        for statement in statements:
+            session.execute(statement)  # The driver waits for schema agreement after each DDL statement
+    return apply
+
+
+# (version, description, apply(session)). Append new migrations; never edit or reorder applied ones
+CASSANDRA_MIGRATIONS = [
+    (1, "students and id_sequences tables", _execute_all(
+        "CREATE TABLE IF NOT EXISTS students (id int PRIMARY KEY, name text, email text, phone_no text, gender text, dob date, stream text)",
+        "CREATE TABLE IF NOT EXISTS id_sequences (name text PRIMARY KEY, next_id int)")),
+    (2, "students_by_email lookup table", _execute_all(EMAIL_LOOKUP_TABLE)),
+    (3, "students_by_name lookup table", _execute_all(NAME_LOOKUP_TABLE)),
+    # Storage-attached indexes need Cassandra 5.0 or AstraDB
+    (4, "storage-attached indexes backing the filter bar", _execute_all(*FILTER_INDEXES)),
+]
+
+
+
+class CassandraSchemaStore:
+    """Schema version kept in one row of the schema_migrations table of the session's keyspace."""
+
+    def __init__(self, session):
+        self.session = session
+
+
+    def version(self):
+        # The driver loads table metadata on connect, so a keyspace never migrated costs no query
+        keyspace = self.session.cluster.metadata.keyspaces.get(self.session.keyspace)
+        if keyspace is None or 'schema_migrations' not in keyspace.tables:
+            return 0
+        row = self.session.execute("SELECT version FROM schema_migrations WHERE name = %s", (SCHEMA_NAME,)).one()
+        return row.version if row else 0
+
+
+    def record(self, version):
+        self.session.execute(SCHEMA_MIGRATIONS_TABLE)
+        self.session.execute("INSERT INTO schema_migrations (name, version) VALUES (%s, %s)", (SCHEMA_NAME, version))
+
+
+
+def migrate_keyspace(session, log=print):
+    return migrate(session, CassandraSchemaStore(session), CASSANDRA_MIGRATIONS, log)
@@ -0,0 +1,106 @@
+import random
+import time
+
+from cassandra.query import BatchStatement, BoundStatement
+
+from slow_operations import SlowOperation, cql_shape
+
+
+# Seconds a trace fetch waits for the coordinator to finish writing system_traces
+TRACE_WAIT_SECONDS = 2.0
+
+
+
+def statement_text(query):
+    if isinstance(query, BoundStatement):
+        return query.prepared_statement.query_string
+    if isinstance(query, BatchStatement):
+        return f"BATCH of {len(query)} statements"
+    return getattr(query, 'query_string', str(query))
+
+
+
+class CassandraRequestMonitor:
+    """Logs each slow or failed request the session sends, with the coordinator that served it.
+
+    Registered as a request init listener, it times every ResponseFuture from
+    send to first response through the future's callbacks, which the driver runs
+    on its event loop thread. trace_percent of the requests are sent with tracing
+    on; when one of those is slow, its trace is read on an executor thread and the
+    coordinator's own duration is added to the log entry.
+    """
+
+    def __init__(self, log, backend, trace_percent=0):
+        self.log = log
+        self.backend = backend
+        self.trace_percent = trace_percent
+        self.session = None
+
+
+    def attach(self, session):
+        self.session = session
+        session.add_request_init_listener(self.request_started)
+
+
+    def request_started(self, future):
+        text = statement_text(future.query)
+        # Reading a trace runs queries of its own, which are never traced
+        if self.trace_percent and random.uniform(0, 100) < self.trace_percent and 'system_traces' not in text:
+            future.message.tracing = True
+        request = PendingRequest(future, text)
+        future.add_callbacks(self.request_succeeded, self.request_failed, callback_args=(request,), errback_args=(request,))
+
+
+    def request_succeeded(self, rows, request):
+        # Later pages of the result run these callbacks again; only the first response is timed
+        duration_ms = request.finish()
+        if duration_ms is None or not self.log.is_slow(duration_ms):
+            return
+        entry = self.entry(request, duration_ms, rows=len(rows) if isinstance(rows, list) else None)
+        self.log.add(entry)
+        if request.future.message.tracing:
+            self.session.submit(self.add_trace, entry, request.future)
+
+
+    def request_failed(self, error, request):
+        duration_ms = request.finish()
+        if duration_ms is not None:
+            self.log.add(self.entry(request, duration_ms, error=str(error)))
+
+
+    def entry(self, request, duration_ms, rows=None, error=None):
+        future = request.future
+        host = future.coordinator_host or future._current_host
+        return SlowOperation(self.backend, request.text.split(None, 1)[0].upper(), cql_shape(request.text), duration_ms,
+                             str(host) if host else "no host",
+                             attempts=max(len(future.attempted_hosts), 1), rows=rows, error=error)
+
+
+    def add_trace(self, entry, future):
+        try:
+            trace = future.get_query_trace(max_wait=TRACE_WAIT_SECONDS)
+        except Exception as e:
+            print("Could not read the trace of a slow request: %s" % e)
+            return
+        if trace is not None and trace.duration is not None:
+            entry.server_ms = trace.duration.total_seconds() * 1000
+            entry.host = str(trace.coordinator)
+
+
+
+class PendingRequest:
+    """A request sent by the session and the time it was sent."""
+
+    def __init__(self, future, text):
+        self.future = future
+        self.text = text
+        self.started = time.perf_counter()
+        self.finished = False
+
+
+    def finish(self):
+        """Milliseconds since the request was sent, or None after the first response."""
+        if self.finished:
+            return None
+        self.finished = True
+        return (time.perf_counter() - self.started) * 1000
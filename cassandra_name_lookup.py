@@ -0,0 +1,101 @@
+from datetime import date
+
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.query import BatchStatement
+
+from cassandra_statements import StatementRegistry, student_values
+from student_filters import name_bucket
+
+
+# students_by_name holds a copy of every student clustered by name within the
+# partition of the name's first letter, so a name prefix search reads one slice of
+# one partition instead of filtering the whole students table
+NAME_LOOKUP_TABLE = ("CREATE TABLE IF NOT EXISTS students_by_name (bucket text, id int, name text, email text, "
+                     "phone_no text, gender text, dob date, stream text, PRIMARY KEY (bucket, name, id))")
+
+# Storage-attached indexes (Cassandra 5.0+ and AstraDB) answer any combination of
+# stream, gender and dob range in one query without ALLOW FILTERING
+FILTER_INDEXES = [
+    "CREATE CUSTOM INDEX IF NOT EXISTS students_stream_sai ON students (stream) USING 'StorageAttachedIndex'",
+    "CREATE CUSTOM INDEX IF NOT EXISTS students_gender_sai ON students (gender) USING 'StorageAttachedIndex'",
+    "CREATE CUSTOM INDEX IF NOT EXISTS students_dob_sai ON students (dob) USING 'StorageAttachedIndex'",
+]
+
+
+
+def name_values(record):
+    """Bind values for insert_student_name: the name's bucket followed by the insert_student values."""
+    return (name_bucket(record['name']),) + student_values(record)
+
+
+
+def student_insert_batch(statements, record):
+    # Logged batch: the student and its students_by_name copy are written together or not at all
+    batch = BatchStatement()
+    batch.add(statements.get('insert_student'), student_values(record))
+    batch.add(statements.get('insert_student_name'), name_values(record))
+    return batch
+
+
+
+def student_changes_batch(statements, record, changes):
+    """Logged batch setting only the changed columns of a student and rewriting its students_by_name copy.
+
+    record is the student as currently stored, every column of it, and changes
+    maps column names to new values. The copy is always written whole from the
+    two: an UPDATE of the copy would upsert a row holding only the changed columns
+    for a student written before the table existed. A new name moves the copy to
+    another clustering key, so the old copy is deleted first. The students
+    statements are prepared per set of columns and cached by the registry.
+    """
+    assignments, values = column_assignments(changes)
+    batch = BatchStatement()
+    batch.add(statements.prepare(f"UPDATE students SET {assignments} WHERE id = ?"), values + (record['id'],))
+    if 'name' in changes and changes['name'] != record['name']:
+        batch.add(statements.get('delete_student_name'), (name_bucket(record['name']), record['name'], record['id']))
+    batch.add(statements.get('insert_student_name'), name_values({**record, **changes}))
+    return batch
+
+
+
+def column_assignments(changes):
+    """("a = ?, b = ?", bind values) for the changed columns, in a stable order so statements are reused."""
+    columns = sorted(changes)
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return assignments, tuple(date.fromisoformat(changes[column]) if column == 'dob' else changes[column] for column in columns)
+
+
+
+def student_delete_batch(statements, record_id, name):
+    batch = BatchStatement()
+    batch.add(statements.get('delete_student'), (record_id,))
+    if name is not None:
+        batch.add(statements.get('delete_student_name'), (name_bucket(name), name, record_id))
+    return batch
+
+
+
+def backfill_name_lookup(session, chunk_size=1000, concurrency=50):
+    """Copy every existing student into students_by_name. Returns the number of students copied.
+
+    Reads the students table page by page and writes each chunk concurrently, so
+    memory stays bounded by chunk_size. Safe to re-run: the copies are upserts.
+    """
+    session.execute(NAME_LOOKUP_TABLE)
+    statements = StatementRegistry(session)
+    insert = statements.get('insert_student_name')
+
+    copied = 0
+    chunk = []
+    for row in statements.execute('select_page', fetch_size=chunk_size):
+        if row.name is None:
+            continue
+        chunk.append((name_bucket(row.name), row.id, row.name, row.email, row.phone_no, row.gender, row.dob, row.stream))
+        if len(chunk) == chunk_size:
+            execute_concurrent_with_args(session, insert, chunk, concurrency=concurrency)
+            copied += len(chunk)
+            chunk = []
+    if chunk:
+        execute_concurrent_with_args(session, insert, chunk, concurrency=concurrency)
+        copied += len(chunk)
+    return copied
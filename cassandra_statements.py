@@ -0,0 +1,102 @@
+from datetime import date
+import threading
+
+
+# Every CQL statement the student GUIs run against the students, id_sequences, students_by_email and
+# students_by_name tables. Filter queries are compiled per filter shape by student_filters
+STUDENT_QUERIES = {
+    'select_page': "SELECT * FROM students",
+    'select_page_from_id': "SELECT * FROM students WHERE token(id) >= token(?)",
+    'select_token_range': "SELECT * FROM students WHERE token(id) > ? AND token(id) <= ?",
+    'select_student': "SELECT * FROM students WHERE id = ?",
+    'select_all_emails': "SELECT id, email FROM students",
+    'select_max_id': "SELECT MAX(id) FROM students",
+    'insert_student': "INSERT INTO students (id, name, email, phone_no, gender, dob, stream) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    'update_student': "UPDATE students SET name = ?, email = ?, phone_no = ?, gender = ?, dob = ?, stream = ? WHERE id = ?",
+    'delete_student': "DELETE FROM students WHERE id = ?",
+    'select_sequence': "SELECT next_id FROM id_sequences WHERE name = ?",
+    'insert_sequence': "INSERT INTO id_sequences (name, next_id) VALUES (?, ?) IF NOT EXISTS",
+    'advance_sequence': "UPDATE id_sequences SET next_id = ? WHERE name = ? IF next_id = ?",
+    'claim_email': "INSERT INTO students_by_email (email, id) VALUES (?, ?) IF NOT EXISTS",
+    'release_email': "DELETE FROM students_by_email WHERE email = ? IF id = ?",
+    'insert_student_name': "INSERT INTO students_by_name (bucket, id, name, email, phone_no, gender, dob, stream) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'delete_student_name': "DELETE FROM students_by_name WHERE bucket = ? AND name = ? AND id = ?",
+}
+
+
+
+def row_to_record(row):
+    return {
+        'id': row.id,
+        'name': row.name,
+        'email': row.email,
+        'phone_no': row.phone_no,
+        'gender': row.gender,
+        'dob': str(row.dob),  # Convert dob to string
+        'stream': row.stream
+    }
+
+
+
+def student_values(record):
+    """Bind values for insert_student, with dob as a native date instead of a string."""
+    return (record['id'], record['name'], record['email'], record['phone_no'], record['gender'],
+            date.fromisoformat(record['dob']), record['stream'])
+
+
+
+def update_values(record):
+    """Bind values for update_student: the six data columns followed by the id."""
+    return student_values(record)[1:] + (record['id'],)
+
+
+
+class StatementRegistry:
+    """Prepares each named query once per session and executes it with bound parameters.
+
+    Prepared statements skip server-side parsing on every call and let the driver
+    route each request straight to a replica that owns the partition (token-aware routing).
+    """
+
+    def __init__(self, session, queries=STUDENT_QUERIES):
+        self.session = session
+        self.queries = dict(queries)
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+
+    def prepare_all(self):
+        for name in self.queries:
+            self.get(name)
+
+
+    def get(self, name):
+        return self.prepare(self.queries[name])
+
+
+    def prepare(self, cql):
+        # Cached by text, so ad-hoc queries such as compiled filters are also prepared only once
+        prepared = self._prepared.get(cql)
+        if prepared is None:
+            with self._lock:
+                prepared = self._prepared.get(cql)
+                if prepared is None:
+                    prepared = self.session.prepare(cql)
+                    self._prepared[cql] = prepared
+        return prepared
+
+
+    def execute(self, name, params=(), fetch_size=None, paging_state=None, timeout=None, host=None):
+        return self.execute_cql(self.queries[name], params, fetch_size=fetch_size, paging_state=paging_state, timeout=timeout,
+                                host=host)
+
+
+    def execute_cql(self, cql, params=(), fetch_size=None, paging_state=None, timeout=None, host=None):
+        # host, if given, is the only node tried, with all of the result's pages
+        bound = self.prepare(cql).bind(params)
+        if fetch_size is not None:
+            bound.fetch_size = fetch_size
+        if timeout is not None:
+            # Seconds per request; the result's later pages are fetched with the same limit
+            return self.session.execute(bound, timeout=timeout, paging_state=paging_state, host=host)
+        return self.session.execute(bound, paging_state=paging_state, host=host)
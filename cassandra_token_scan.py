@@ -0,0 +1,132 @@
+import queue
+import threading
+
+from cassandra.metadata import Murmur3Token
+from cassandra.policies import HostDistance
+
+from cassandra_statements import row_to_record
+
+
+# Murmur3Partitioner token bounds; no key ever hashes to MIN_TOKEN
+MIN_TOKEN = -2 ** 63
+MAX_TOKEN = 2 ** 63 - 1
+
+_DONE = object()
+
+
+
+def token_ranges(splits, start=MIN_TOKEN, end=MAX_TOKEN):
+    """Split the (start, end] token range, by default the whole ring, into splits contiguous (start, end] ranges."""
+    step = max((end - start) // splits, 1)
+    bounds = [start + i * step for i in range(splits) if start + i * step < end] + [end]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+
+def replica_ranges(session, splits):
+    """(start, end, host) sub-ranges covering the ring, each inside one node's token range.
+
+    host is a live replica of the range, preferring the local datacenter and
+    taking turns between replicas; it is None when the driver has no token map
+    for the keyspace, and the ring is then split evenly for the load balancer to route.
+    """
+    cluster = session.cluster
+    token_map = cluster.metadata.token_map
+    if token_map is None or token_map.token_class is not Murmur3Token or not token_map.ring:
+        return [(start, end, None) for start, end in token_ranges(splits)]
+
+    ring = token_map.ring
+    # The ring wraps: (MIN_TOKEN, first] and (last, MAX_TOKEN] both belong to the first token's replicas
+    owned = [(MIN_TOKEN if start is None else start.value, token.value, token) for start, token in zip([None] + ring[:-1], ring)]
+    owned.append((ring[-1].value, MAX_TOKEN, ring[0]))
+    per_range = -(-splits // len(owned))  # At least one query per node range
+
+    policy = cluster.profile_manager.default.load_balancing_policy
+    ranges = []
+    for start, end, token in owned:
+        if start >= end:
+            continue
+        replicas = [host for host in token_map.get_replicas(session.keyspace, token) if host.is_up]
+        local = [host for host in replicas if policy.distance(host) == HostDistance.LOCAL]
+        replicas = local or replicas
+        for sub_start, sub_end in token_ranges(per_range, start, end):
+            ranges.append((sub_start, sub_end, replicas[len(ranges) % len(replicas)] if replicas else None))
+    return ranges
+
+
+
+class TokenRangeScanner:
+    """Full-table scan that reads token sub-ranges of students concurrently.
+
+    A single SELECT * walks the ring one page at a time through one coordinator.
+    Here the ring is split along the nodes' token ranges (from the driver's token
+    map) into at least splits sub-ranges. Each is paged through by one of a
+    bounded set of threads and sent straight to a live replica owning it, since a
+    token(id) range query has no routing key for the token-aware policy to use.
+    A full scan thus uses every node at once. Records are yielded as soon as any range
+    produces them, in no particular order. A bounded queue between the readers and
+    the consumer keeps memory flat when the consumer (a scrolling grid or an export
+    file) is slower than the cluster.
+    """
+
+    def __init__(self, session, statements, splits=None, concurrency=None, fetch_size=1000):
+        self.session = session
+        self.statements = statements
+        hosts = max(len(session.cluster.metadata.all_hosts()), 1)
+        self.splits = splits or 8 * hosts
+        self.concurrency = concurrency or min(self.splits, 4 * hosts)
+        self.fetch_size = fetch_size
+
+
+    def scan(self):
+        # The token map is read at each scan, so ranges follow nodes joining or leaving
+        ranges = queue.Queue()
+        for token_range in replica_ranges(self.session, self.splits):
+            ranges.put(token_range)
+        records = queue.Queue(maxsize=self.fetch_size * self.concurrency)
+        stop = threading.Event()
+
+        workers = [threading.Thread(target=self._read_ranges, args=(ranges, records, stop), daemon=True)
+                   for _ in range(min(self.concurrency, ranges.qsize()))]
+        for worker in workers:
+            worker.start()
+
+        try:
+            running = len(workers)
+            while running:
+                item = records.get()
+                if item is _DONE:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # Consumer finished or gave up early: let blocked readers exit
+            stop.set()
+
+
+    def _read_ranges(self, ranges, records, stop):
+        try:
+            while not stop.is_set():
+                try:
+                    start, end, host = ranges.get_nowait()
+                except queue.Empty:
+                    break
+                rows = self.statements.execute('select_token_range', (start, end), fetch_size=self.fetch_size, host=host)
+                for row in rows:
+                    if not self._put(records, row_to_record(row), stop):
+                        return
+        except Exception as e:
+            self._put(records, e, stop)
+        self._put(records, _DONE, stop)
+
+
+    def _put(self, records, item, stop):
+        while not stop.is_set():
+            try:
+                records.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
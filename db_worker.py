@@ -0,0 +1,86 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# Database calls run at once; DB_WORKER_THREADS in .env overrides it
+DB_WORKER_THREADS = 4
+
+
+
+class JobSignals(QObject):
+    # Emitted from the worker thread; Qt queues delivery onto the GUI thread
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+
+
+
+class DbJob(QRunnable):
+
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+
+
+
+class DbExecutor(QObject):
+    """Runs database calls on a thread pool and hands results back to the GUI thread.
+
+    Jobs submitted while every thread is busy are queued and started in submission
+    order as threads free up. Callbacks always run on the GUI thread, so they may touch widgets.
+    """
+
+    pending_changed = pyqtSignal(int)
+    job_failed = pyqtSignal(object)
+
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or DB_WORKER_THREADS)
+        self._jobs = set()
+
+
+    def submit(self, fn, *args, on_result=None, on_error=None, **kwargs):
+        job = DbJob(fn, args, kwargs)
+        job.signals.result.connect(lambda result: self._finish(job, on_result, result))
+        job.signals.error.connect(lambda error: self._fail(job, on_error, error))
+        self._jobs.add(job)
+        self.pending_changed.emit(len(self._jobs))
+        self.pool.start(job)
+
+
+    def pending(self):
+        return len(self._jobs)
+
+
+    def _finish(self, job, callback, result):
+        self._done(job)
+        if callback is not None:
+            callback(result)
+
+
+    def _fail(self, job, callback, error):
+        self._done(job)
+        if callback is not None:
+            callback(error)
+        else:
+            self.job_failed.emit(error)
+
+
+    def _done(self, job):
+        self._jobs.discard(job)
+        self.pending_changed.emit(len(self._jobs))
+
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,153 @@
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QWidget, QFormLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox, QDialogButtonBox,
+                             QSpinBox)
+
+
+LATENCY_COLUMNS = [('backend', "Backend"), ('operation', "Operation"), ('count', "Count"), ('errors', "Errors"),
+                   ('p50_ms', "p50 ms"), ('p95_ms', "p95 ms"), ('p99_ms', "p99 ms"), ('max_ms', "Max ms")]
+
+SLOW_OPERATION_COLUMNS = [('when', "Time"), ('backend', "Backend"), ('operation', "Operation"), ('duration_ms', "Round trip ms"),
+                          ('server_ms', "Server ms"), ('attempts', "Attempts"), ('host', "Host"), ('bytes_sent', "Sent bytes"),
+                          ('bytes_received', "Received bytes"), ('rows', "Rows"), ('shape', "Query shape"), ('error', "Error")]
+
+
+
+class DiagnosticsDialog(QDialog):
+    """Shows which database the window uses, the driver settings in effect, per-operation
+    latencies and the driver's slow requests."""
+
+    def __init__(self, backend, connected, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self.setWindowTitle("Diagnostics")
+        self.resize(720, 420)
+        layout = QVBoxLayout(self)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.settings_tab(backend, connected), "Driver settings")
+        self.tabs.addTab(self.latency_tab(), "Latency")
+        self.tabs.addTab(self.slow_operations_tab(), "Slow operations")
+        layout.addWidget(self.tabs)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+
+    def settings_tab(self, backend, connected):
+        tab = QWidget()
+        form = QFormLayout(tab)
+        form.addRow("Database:", QLabel(backend.description))
+        # Before the first connection only the configured values are known
+        form.addRow("Values:", QLabel("read back from the connected driver" if connected else "as configured, not connected yet"))
+        for setting, value in backend.driver_settings():
+            form.addRow(f"{setting}:", QLabel(str(value)))
+        return tab
+
+
+    def latency_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        self.latency_table = QTableWidget(0, len(LATENCY_COLUMNS))
+        self.latency_table.setHorizontalHeaderLabels([header for _, header in LATENCY_COLUMNS])
+        self.latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.latency_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.latency_table)
+
+        row = QHBoxLayout()
+        button_refresh = QPushButton("Refresh")
+        button_refresh.clicked.connect(self.show_latencies)
+        button_save = QPushButton("Save...")
+        button_save.setToolTip("Write the histograms as Prometheus text, or as JSON for a .json file")
+        button_save.clicked.connect(self.save_latencies)
+        row.addStretch()
+        row.addWidget(button_refresh)
+        row.addWidget(button_save)
+        layout.addLayout(row)
+
+        self.show_latencies()
+        return tab
+
+
+    def show_latencies(self):
+        summary = self.backend.metrics.summary()
+        self.latency_table.setRowCount(len(summary))
+        for row, operation in enumerate(summary):
+            for column, (key, _) in enumerate(LATENCY_COLUMNS):
+                value = operation[key]
+                item = QTableWidgetItem(f"{value:.2f}" if isinstance(value, float) else str(value))
+                if not isinstance(value, str):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.latency_table.setItem(row, column, item)
+
+
+    def save_latencies(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save latency metrics", "student_db_latency.prom",
+                                              "Prometheus text (*.prom *.txt);;JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.backend.metrics.dump(path)
+        except OSError as e:
+            QMessageBox.critical(self, 'Error', f'An error occurred: {str(e)}')
+
+
+    def slow_operations_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        self.slow_table = QTableWidget(0, len(SLOW_OPERATION_COLUMNS))
+        self.slow_table.setHorizontalHeaderLabels([header for _, header in SLOW_OPERATION_COLUMNS])
+        self.slow_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.slow_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.slow_table)
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Log requests slower than"))
+        # The monitors read the threshold on every request, so a change applies from the next one on
+        self.slow_threshold = QSpinBox()
+        self.slow_threshold.setRange(0, 600000)
+        self.slow_threshold.setSuffix(" ms")
+        self.slow_threshold.setValue(self.backend.slow_operations.threshold_ms)
+        self.slow_threshold.valueChanged.connect(self.set_slow_threshold)
+        row.addWidget(self.slow_threshold)
+        row.addStretch()
+        button_refresh = QPushButton("Refresh")
+        button_refresh.clicked.connect(self.show_slow_operations)
+        button_clear = QPushButton("Clear")
+        button_clear.clicked.connect(self.clear_slow_operations)
+        row.addWidget(button_refresh)
+        row.addWidget(button_clear)
+        layout.addLayout(row)
+
+        self.show_slow_operations()
+        return tab
+
+
+    def show_slow_operations(self):
+        entries = self.backend.slow_operations.entries()
+        self.slow_table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            for column, (key, _) in enumerate(SLOW_OPERATION_COLUMNS):
+                value = getattr(entry, key)
+                if key == 'when':
+                    text = time.strftime('%H:%M:%S', time.localtime(value))
+                elif value is None:
+                    text = ""
+                else:
+                    text = f"{value:.1f}" if isinstance(value, float) else str(value)
+                item = QTableWidgetItem(text)
+                if isinstance(value, (int, float)) and key != 'when':
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.slow_table.setItem(row, column, item)
+
+
+    def set_slow_threshold(self, threshold_ms):
+        self.backend.slow_operations.threshold_ms = threshold_ms
+
+
+    def clear_slow_operations(self):
+        self.backend.slow_operations.clear()
+        self.show_slow_operations()
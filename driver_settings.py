@@ -0,0 +1,158 @@
+import os
+
+
+class DriverSettingsError(ValueError):
+    """A driver setting in .env or the environment has an invalid value."""
+
+
+
+def env_int(name, default=None, minimum=0):
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise DriverSettingsError(f"{name} must be a whole number, not {value!r}") from None
+    if number < minimum:
+        raise DriverSettingsError(f"{name} must be at least {minimum}, not {number}")
+    return number
+
+
+
+def env_bool(name, default):
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return default
+    if value not in ("1", "true", "yes", "0", "false", "no"):
+        raise DriverSettingsError(f"{name} must be true or false, not {value!r}")
+    return value in ("1", "true", "yes")
+
+
+
+class MongoDriverSettings:
+    """MongoClient connection pool settings, read from the environment when created.
+
+    Unset variables keep the driver defaults. Values are validated here, so a bad
+    setting stops the launcher instead of failing on the first connect.
+    """
+
+    def __init__(self):
+        self.max_pool_size = env_int("MONGODB_MAX_POOL_SIZE", 100)  # 0 means no limit
+        self.min_pool_size = env_int("MONGODB_MIN_POOL_SIZE", 0)
+        self.max_idle_time_ms = env_int("MONGODB_MAX_IDLE_TIME_MS", minimum=1)  # None keeps idle connections
+        self.server_selection_timeout_ms = env_int("MONGODB_SERVER_SELECTION_TIMEOUT_MS", 30000, minimum=1)
+        if self.max_pool_size and self.min_pool_size > self.max_pool_size:
+            raise DriverSettingsError(f"MONGODB_MIN_POOL_SIZE ({self.min_pool_size}) cannot exceed "
+                                      f"MONGODB_MAX_POOL_SIZE ({self.max_pool_size})")
+
+
+    def client_options(self):
+        return {
+            'maxPoolSize': self.max_pool_size,
+            'minPoolSize': self.min_pool_size,
+            'maxIdleTimeMS': self.max_idle_time_ms,
+            'serverSelectionTimeoutMS': self.server_selection_timeout_ms,
+        }
+
+
+    def effective(self, client=None):
+        """(setting, value) rows for the diagnostics panel, read back from client once connected."""
+        if client is None:
+            max_pool, min_pool, idle_ms = self.max_pool_size, self.min_pool_size, self.max_idle_time_ms
+            selection_ms = self.server_selection_timeout_ms
+        else:
+            pool = client.options.pool_options
+            max_pool, min_pool = pool.max_pool_size, pool.min_pool_size
+            idle_ms = None if pool.max_idle_time_seconds is None else int(pool.max_idle_time_seconds * 1000)
+            selection_ms = int(client.options.server_selection_timeout * 1000)
+        return [
+            ('maxPoolSize', max_pool or "no limit"),
+            ('minPoolSize', min_pool),
+            ('maxIdleTimeMS', "never closed" if idle_ms is None else idle_ms),
+            ('serverSelectionTimeoutMS', selection_ms),
+        ]
+
+
+
+class CassandraDriverSettings:
+    """Cluster tuning read from the environment when created: executor threads, protocol
+    version, connections per host, the load-balancing policy and request tracing.
+
+    Unset variables keep the driver defaults, except that the policy is always made
+    explicit as TokenAwarePolicy(DCAwareRoundRobinPolicy), so requests go to a
+    replica of the partition in the local datacenter.
+    """
+
+    def __init__(self):
+        from cassandra import ProtocolVersion
+
+        self.executor_threads = env_int("CASSANDRA_EXECUTOR_THREADS", 2, minimum=1)
+        self.protocol_version = env_int("CASSANDRA_PROTOCOL_VERSION", minimum=1)  # None negotiates the highest common version
+        self.connections_per_host = env_int("CASSANDRA_CONNECTIONS_PER_HOST", minimum=1)
+        self.local_dc = os.getenv("CASSANDRA_LOCAL_DC", "").strip()  # Empty takes the first contact point's DC
+        self.used_hosts_per_remote_dc = env_int("CASSANDRA_USED_HOSTS_PER_REMOTE_DC", 0)
+        self.token_aware = env_bool("CASSANDRA_TOKEN_AWARE", True)
+        self.scan_splits = env_int("SCAN_SPLITS", minimum=1)  # None splits full-table reads 8 ways per node
+        self.scan_concurrency = env_int("SCAN_CONCURRENCY", minimum=1)  # None reads 4 ranges at a time per node
+        self.trace_percent = env_int("CASSANDRA_TRACE_PERCENT", 0)  # Requests sent with tracing on, for the slow operations log
+        self.dc_policy = None
+
+        if self.trace_percent > 100:
+            raise DriverSettingsError(f"CASSANDRA_TRACE_PERCENT must be at most 100, not {self.trace_percent}")
+        if self.protocol_version is not None and self.protocol_version not in ProtocolVersion.SUPPORTED_VERSIONS:
+            raise DriverSettingsError(f"CASSANDRA_PROTOCOL_VERSION {self.protocol_version} is not supported by this driver")
+        # From protocol v3 on, the driver multiplexes every request over one connection per host
+        if self.connections_per_host is not None and (self.protocol_version is None or self.protocol_version > 2):
+            raise DriverSettingsError("CASSANDRA_CONNECTIONS_PER_HOST needs CASSANDRA_PROTOCOL_VERSION 1 or 2; "
+                                      "later protocol versions always use one connection per host")
+
+
+    def cluster_options(self):
+        from cassandra.cluster import ExecutionProfile, EXEC_PROFILE_DEFAULT
+        from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+
+        self.dc_policy = DCAwareRoundRobinPolicy(local_dc=self.local_dc, used_hosts_per_remote_dc=self.used_hosts_per_remote_dc)
+        policy = TokenAwarePolicy(self.dc_policy) if self.token_aware else self.dc_policy
+        options = {
+            'executor_threads': self.executor_threads,
+            'execution_profiles': {EXEC_PROFILE_DEFAULT: ExecutionProfile(load_balancing_policy=policy)},
+        }
+        if self.protocol_version is not None:
+            options['protocol_version'] = self.protocol_version
+        return options
+
+
+    def apply(self, cluster):
+        # Only called before connect(); pools opened afterwards use these sizes
+        if self.connections_per_host is not None:
+            from cassandra.policies import HostDistance
+
+            cluster.set_max_connections_per_host(HostDistance.LOCAL, self.connections_per_host)
+            cluster.set_core_connections_per_host(HostDistance.LOCAL, self.connections_per_host)
+
+
+    def policy_name(self):
+        # Once connected, the policy knows the datacenter it picked from the contact points
+        local_dc = (self.dc_policy and self.dc_policy.local_dc) or self.local_dc or "from first contact point"
+        policy = f"DCAwareRoundRobinPolicy(local_dc={local_dc}, used_hosts_per_remote_dc={self.used_hosts_per_remote_dc})"
+        return f"TokenAwarePolicy({policy})" if self.token_aware else policy
+
+
+    def effective(self, cluster=None):
+        """(setting, value) rows for the diagnostics panel, read back from cluster once connected."""
+        if cluster is None:
+            protocol = self.protocol_version or "negotiated"
+            connections = self.connections_per_host or "1 (protocol v3+)"
+        else:
+            from cassandra.policies import HostDistance
+
+            protocol = cluster.protocol_version
+            connections = cluster.get_core_connections_per_host(HostDistance.LOCAL) if protocol <= 2 else "1 (protocol v3+)"
+        return [
+            ('executor_threads', self.executor_threads),
+            ('protocol_version', protocol),
+            ('connections per host', connections),
+            ('load_balancing_policy', self.policy_name()),
+            ('traced requests', f"{self.trace_percent}%"),
+        ]
@@ -0,0 +1,117 @@
+import threading
+from abc import ABC, abstractmethod
+
+from driver_settings import env_int
+
+
+# Ids reserved per round trip; ID_BLOCK_SIZE in .env overrides it
+ID_BLOCK_SIZE = 1000
+
+
+
+def id_block_size():
+    return env_int("ID_BLOCK_SIZE", ID_BLOCK_SIZE, minimum=1)
+
+
+
+class IdSequence(ABC):
+    """Hands out student ids from blocks reserved in the database.
+
+    Each reservation claims a whole block of consecutive ids in a single round trip,
+    so most calls to next_id() never touch the database and two clients can never
+    be given the same id. Ids left in a block when the application exits are skipped.
+    """
+
+    def __init__(self, name='students', block_size=None):
+        self.name = name
+        self.block_size = block_size or id_block_size()
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+
+    def next_id(self):
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self._reserve(self.block_size)
+                self._end = self._next + self.block_size
+            record_id = self._next
+            self._next += 1
+            return record_id
+
+
+    def reserve(self, count):
+        """Reserve count consecutive ids in one round trip, for bulk loads."""
+        start = self._reserve(count)
+        return range(start, start + count)
+
+
+    @abstractmethod
+    def _reserve(self, count):
+        """Atomically advance the stored sequence by count and return the first reserved id."""
+
+
+
+class CassandraIdSequence(IdSequence):
+    """Sequence stored in the id_sequences table and advanced with a lightweight transaction."""
+
+    def __init__(self, statements, name='students', block_size=None):
+        super().__init__(name, block_size)
+        self.statements = statements
+
+
+    def _reserve(self, count):
+        row = self.statements.execute('select_sequence', (self.name,)).one()
+        current = row.next_id if row is not None else self._seed()
+        while True:
+            result = self.statements.execute('advance_sequence', (current + count, self.name, current))
+            if result.was_applied:
+                return current
+            # Another client advanced the sequence first; the failed update returns its current value
+            current = result.one().next_id
+
+
+    def _seed(self):
+        # First use against an existing table: start after the highest id, scanning the table only this once
+        last_id = self.statements.execute('select_max_id').one()[0] or 0
+        result = self.statements.execute('insert_sequence', (self.name, last_id + 1))
+        if result.was_applied:
+            return last_id + 1
+        # Another client created the sequence first; the failed insert returns its current value
+        return result.one().next_id
+
+
+
+class MongoIdSequence(IdSequence):
+    """Sequence stored in the counters collection and advanced with find_one_and_update($inc)."""
+
+    def __init__(self, db, name='students', block_size=None):
+        super().__init__(name, block_size)
+        self.counters = db['counters']
+        self.collection = db[name]
+        self._seeded = False
+
+
+    def _reserve(self, count):
+        # Imported here so the Cassandra backend does not need pymongo
+        from pymongo import ReturnDocument
+
+        if not self._seeded:
+            self._seed()
+            self._seeded = True
+        counter = self.counters.find_one_and_update(
+            {'_id': self.name},
+            {'$inc': {'seq': count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        # 'seq' is the last id handed out, so the reserved block ends at it
+        return counter['seq'] - count + 1
+
+
+    def _seed(self):
+        # Start the counter after ids assigned before it existed; $max never moves it backwards,
+        # so clients seeding at the same time cannot hand out an id twice
+        last_record = self.collection.find_one(sort=[('id', -1)], projection={'id': 1})
+        last_id = last_record['id'] if last_record else 0
+        self.counters.update_one({'_id': self.name}, {'$max': {'seq': last_id}}, upsert=True)
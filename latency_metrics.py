@@ -0,0 +1,217 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Histogram bucket upper bounds in seconds, 0.1 ms to 60 s in 1-2-5 steps
+BUCKET_BOUNDS = [scale * 10 ** exponent for exponent in range(-4, 2) for scale in (1, 2, 5)] + [60]
+
+PROMETHEUS_METRIC = 'student_db_operation_seconds'
+PROMETHEUS_ERRORS_METRIC = 'student_db_operation_errors_total'
+
+
+
+class LatencyHistogram:
+    """Count, error count, sum, maximum and bucketed latencies of one kind of operation."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # The last bucket is everything above 60 s
+
+
+    def record(self, seconds, error=False):
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        index = 0
+        while index < len(BUCKET_BOUNDS) and seconds > BUCKET_BOUNDS[index]:
+            index += 1
+        self.buckets[index] += 1
+
+
+    def quantile(self, q):
+        """Latency in seconds below which a fraction q of the operations fall.
+
+        Interpolated linearly inside the bucket holding the q-th operation, the same
+        estimate Prometheus' histogram_quantile() makes, and capped at the maximum seen.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, in_bucket in enumerate(self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                lower = BUCKET_BOUNDS[index - 1] if index else 0.0
+                upper = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / in_bucket, self.max)
+            seen += in_bucket
+        return self.max
+
+
+
+class OperationMetrics:
+    """Latency histograms keyed by (backend, operation), safe to update from any thread."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+
+    def record(self, backend, operation, seconds, error=False):
+        with self._lock:
+            histogram = self._histograms.get((backend, operation))
+            if histogram is None:
+                histogram = self._histograms[(backend, operation)] = LatencyHistogram()
+            histogram.record(seconds, error)
+
+
+    @contextmanager
+    def time(self, backend, operation):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(backend, operation, time.perf_counter() - start, error=True)
+            raise
+        self.record(backend, operation, time.perf_counter() - start)
+
+
+    def summary(self):
+        """One dict per (backend, operation), sorted, with latencies in milliseconds."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [{
+                'backend': backend,
+                'operation': operation,
+                'count': histogram.count,
+                'errors': histogram.errors,
+                'mean_ms': histogram.total / histogram.count * 1000,
+                'p50_ms': histogram.quantile(0.50) * 1000,
+                'p95_ms': histogram.quantile(0.95) * 1000,
+                'p99_ms': histogram.quantile(0.99) * 1000,
+                'max_ms': histogram.max * 1000,
+            } for (backend, operation), histogram in items]
+
+
+    def prometheus_text(self):
+        """The histograms in the Prometheus text exposition format, e.g. for the node exporter's textfile collector."""
+        lines = [f"# HELP {PROMETHEUS_METRIC} Latency of database operations.",
+                 f"# TYPE {PROMETHEUS_METRIC} histogram"]
+        errors = [f"# HELP {PROMETHEUS_ERRORS_METRIC} Database operations that raised an error.",
+                  f"# TYPE {PROMETHEUS_ERRORS_METRIC} counter"]
+        with self._lock:
+            for (backend, operation), histogram in sorted(self._histograms.items()):
+                labels = f'backend="{backend}",operation="{operation}"'
+                cumulative = 0
+                for bound, in_bucket in zip(BUCKET_BOUNDS + ['+Inf'], histogram.buckets):
+                    cumulative += in_bucket
+                    lines.append(f'{PROMETHEUS_METRIC}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{PROMETHEUS_METRIC}_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"{PROMETHEUS_METRIC}_count{{{labels}}} {histogram.count}")
+                errors.append(f"{PROMETHEUS_ERRORS_METRIC}{{{labels}}} {histogram.errors}")
+        return "\n".join(lines + errors) + "\n"
+
+
+    def dump(self, path):
+        """Write the metrics to path: JSON if it ends in .json, Prometheus text otherwise."""
+        if path.endswith('.json'):
+            text = json.dumps(self.summary(), indent=2) + "\n"
+        else:
+            text = self.prometheus_text()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+
+def timed(operation):
+    """Decorator for backend methods: records each call's latency in self.metrics under self.name."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.time(self.name, operation):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+
+class TimedRows:
+    """Iterates over a lazily fetched result, recording each batch_size rows read as one operation.
+
+    Only the time spent inside the source is counted, not the time the consumer
+    spends between rows, so a batch's latency is the round trips it needed.
+    """
+
+    def __init__(self, rows, metrics, backend, operation, batch_size):
+        self.rows = iter(rows)
+        self.source = rows
+        self.metrics = metrics
+        self.backend = backend
+        self.operation = operation
+        self.batch_size = batch_size
+        self.elapsed = 0.0
+        self.pending = 0
+        self.batches = 0
+        self.finished = False
+
+
+    def __iter__(self):
+        return self
+
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = next(self.rows)
+        except StopIteration:
+            self.elapsed += time.perf_counter() - start
+            # The end of a result is a batch of its own only if rows are left over, or there were none
+            if not self.finished and (self.pending or not self.batches):
+                self._record()
+            self.finished = True
+            raise
+        except Exception:
+            self.elapsed += time.perf_counter() - start
+            self._record(error=True)
+            raise
+        self.elapsed += time.perf_counter() - start
+        self.pending += 1
+        if self.pending == self.batch_size:
+            self._record()
+        return row
+
+
+    def _record(self, error=False):
+        self.metrics.record(self.backend, self.operation, self.elapsed, error)
+        self.elapsed = 0.0
+        self.pending = 0
+        self.batches += 1
+
+
+    def close(self):
+        # Release the server-side cursor of the source, as the table model does for a bare cursor
+        close = getattr(self.source, 'close', None)
+        if close is not None:
+            close()
+
+
+
+class TimedWriter:
+    """Wraps an import writer, recording each write() of a batch as one operation."""
+
+    def __init__(self, writer, metrics, backend, operation):
+        self.writer = writer
+        self.metrics = metrics
+        self.backend = backend
+        self.operation = operation
+
+
+    def write(self, records):
+        with self.metrics.time(self.backend, self.operation):
+            return self.writer.write(records)
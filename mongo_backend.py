@@ -0,0 +1,225 @@
+import os
+
+from pymongo import MongoClient
+import pymongo
+
+from student_import import MongoStudentWriter
+from student_export import EXPORT_BATCH_SIZE
+from student_filters import SEARCH_TIMEOUT_MS, describe_mongo_plan
+from mongo_migrations import MONGO_MIGRATIONS, migrate_database
+from id_sequence import id_block_size, MongoIdSequence
+from driver_settings import MongoDriverSettings
+from student_validation import RecordError
+from latency_metrics import OperationMetrics, TimedRows, TimedWriter, timed
+from slow_operations import slow_operation_log
+from mongo_monitoring import MongoCommandMonitor
+
+
+
+class MongoBackend:
+    """Student storage in the students collection of a MongoDB deployment.
+
+    Every method except open() and start() needs a started backend. The window
+    calls them on worker threads, so none of them touches Qt. Each database
+    operation's latency is recorded in metrics under the backend's name, and
+    the driver's slow or failed commands in slow_operations.
+    """
+
+    migrations = MONGO_MIGRATIONS
+
+    # Go to ID pages through the filtered result from the given id
+    jump_within_filter = True
+
+    def __init__(self, name, uri, description, settings):
+        self.name = name
+        self.uri = uri
+        self.description = description
+        self.settings = settings
+        # Read here, with the driver settings, so a bad value stops the launcher
+        self.id_block_size = id_block_size()
+        self.metrics = OperationMetrics()
+        self.slow_operations = slow_operation_log()
+        self.client = None
+        self.unique_email_index = False
+
+
+    def open(self):
+        try:
+            monitor = MongoCommandMonitor(self.slow_operations, self.name)
+            self.client = MongoClient(self.uri, event_listeners=[monitor], **self.settings.client_options())
+            print("Connected to %s" % self.description)
+        except pymongo.errors.ConnectionFailure as e:
+            print("Could not connect to %s: %s" % (self.description, e))
+            raise
+        self.db = self.client['student_management']
+        self.collection = self.db['students']
+
+
+    @timed('migrate')
+    def migrate(self):
+        return migrate_database(self.db)
+
+
+    def setup_schema(self):
+        # Indexes (unique id and email, filter bar) are only built when the recorded schema version is behind
+        try:
+            self.migrate()
+        except pymongo.errors.OperationFailure as e:
+            print("Schema migration failed, fix the cause and run with --migrate: %s" % e)
+
+        # The email index cannot be built while duplicate emails exist; until then every write looks the email up first
+        self.unique_email_index = any(index.get('unique') and index['key'] == [('email', pymongo.ASCENDING)]
+                                      for index in self.collection.index_information().values())
+        if not self.unique_email_index:
+            print("No unique index on students.email: emails are checked before each write until --migrate succeeds")
+
+
+    def check_email_unused(self, email, record_id=None):
+        # Only needed without the unique email index, which otherwise rejects duplicates on write
+        if not self.unique_email_index and self.collection.find_one({'email': email, 'id': {'$ne': record_id}}, {'_id': 1}):
+            raise RecordError("Email already exists! Please enter a unique email.")
+
+
+    @timed('connect')
+    def start(self):
+        self.open()
+        try:
+            # MongoClient connects lazily, so ping to report an unreachable server now
+            self.client.admin.command('ping')
+            self.setup_schema()
+        except Exception:
+            self.close()
+            raise
+
+        # Ids are handed out locally from blocks reserved in the counters collection
+        self.id_sequence = MongoIdSequence(self.db, block_size=self.id_block_size)
+
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+
+
+    def driver_settings(self):
+        return self.settings.effective(self.client)
+
+
+    def scroll_source(self, student_filter, batch_size):
+        # The cursor is read lazily, one batch per fetchMore() as the user scrolls
+        cursor = self.collection.find(student_filter.mongo_query(), {'_id': 0}).batch_size(batch_size)
+        if not student_filter.is_empty():
+            cursor.max_time_ms(SEARCH_TIMEOUT_MS)
+        return TimedRows(cursor, self.metrics, self.name, 'scroll_batch', batch_size)
+
+
+    def first_page_cursor(self):
+        return 0  # Ids start at 1
+
+
+    def page_cursor_for_id(self, record_id):
+        return record_id - 1
+
+
+    @timed('fetch_page')
+    def fetch_page(self, student_filter, after_id, page_size):
+        records = list(self.page_query(student_filter, after_id, page_size))
+        # The extra record only tells whether there is a next page
+        next_cursor = records[page_size - 1]['id'] if len(records) > page_size else None
+        return records[:page_size], next_cursor
+
+
+    def page_query(self, student_filter, after_id, page_size):
+        # Keyset pagination: the id index seeks straight to the page start, however deep the page is
+        query = {**student_filter.mongo_query(), 'id': {'$gt': after_id}}
+        cursor = self.collection.find(query, {'_id': 0}).sort('id', pymongo.ASCENDING).limit(page_size + 1)
+        return cursor if student_filter.is_empty() else cursor.max_time_ms(SEARCH_TIMEOUT_MS)
+
+
+    @timed('explain')
+    def explain_filter(self, student_filter, page_size):
+        query = student_filter.mongo_query()
+        scroll_plan = describe_mongo_plan(self.collection.find(query, {'_id': 0}).explain())
+        page_plan = describe_mongo_plan(self.page_query(student_filter, self.first_page_cursor(), page_size).explain())
+        return f"Filter: {query}\n\nScrolling: {scroll_plan}\nPaged view: {page_plan}"
+
+
+    @timed('insert')
+    def insert_record(self, new_record):
+        # Insert the new record into the collection; the unique email index rejects duplicates
+        self.check_email_unused(new_record['email'])
+        record = {'id': self.id_sequence.next_id(), **new_record}
+        try:
+            self.collection.insert_one(dict(record))  # insert_one adds '_id' to the dict it is given
+        except pymongo.errors.DuplicateKeyError as e:
+            self.raise_duplicate_email(e)
+        return record
+
+
+    def raise_duplicate_email(self, error):
+        # keyPattern names the violated index; servers older than 4.2 only mention it in errmsg
+        details = error.details or {}
+        if 'email' in details.get('keyPattern', {}) or 'email_1' in details.get('errmsg', ''):
+            raise RecordError("Email already exists! Please enter a unique email.") from error
+        raise error
+
+
+    @timed('delete')
+    def delete_records(self, record_ids):
+        result = self.collection.delete_many({'id': {'$in': record_ids}})
+        if result.deleted_count == 0:
+            raise RecordError('No record found with the provided ID.')
+        return record_ids
+
+
+    @timed('find')
+    def find_record(self, record_id):
+        return self.collection.find_one({'id': record_id}, {'_id': 0})
+
+
+    @timed('update')
+    def save_record(self, original, changes):
+        # The unique email index is only consulted when the email is among the changed fields
+        if 'email' in changes:
+            self.check_email_unused(changes['email'], original['id'])
+        try:
+            result = self.collection.update_one({'id': original['id']}, {'$set': changes})
+        except pymongo.errors.DuplicateKeyError as e:
+            self.raise_duplicate_email(e)
+        if result.matched_count == 0:
+            raise RecordError('No record found with the provided ID.')
+        return {**original, **changes}
+
+
+    @timed('bulk_count')
+    def count_bulk_targets(self, record_ids, student_filter):
+        query = {'id': {'$in': record_ids}} if record_ids is not None else student_filter.mongo_query()
+        return query, self.collection.count_documents(query)
+
+
+    @timed('bulk_update')
+    def apply_bulk_update(self, query, changes):
+        # One server-side update_many, whatever the number of students
+        return self.collection.update_many(query, {'$set': changes}).modified_count
+
+
+    def student_writer(self):
+        writer = MongoStudentWriter(self.collection, self.id_sequence, check_emails=not self.unique_email_index)
+        return TimedWriter(writer, self.metrics, self.name, 'import_batch')
+
+
+    def export_records(self):
+        # Project away '_id' and read in batches; the cursor streams straight into the file
+        cursor = self.collection.find({}, {'_id': 0}).batch_size(EXPORT_BATCH_SIZE)
+        return TimedRows(cursor, self.metrics, self.name, 'export_batch', EXPORT_BATCH_SIZE)
+
+
+
+def local_backend():
+    # Replace 'localhost' and '27017' with your MongoDB host and port
+    return MongoBackend('mongodb', "mongodb://localhost:27017/", "local MongoDB instance", MongoDriverSettings())
+
+
+
+def atlas_backend():
+    # Set MONGODB_ATLAS_URI in .env to your MongoDB Atlas connection URI
+    return MongoBackend('atlas', os.getenv("MONGODB_ATLAS_URI"), "MongoDB Atlas", MongoDriverSettings())
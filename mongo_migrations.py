@@ -0,0 +1,44 @@
+import pymongo
+
+from schema_migrations import SCHEMA_NAME, migrate
+from student_filters import MONGO_FILTER_INDEXES
+
+
+
+def _create_filter_indexes(db):
+    for keys in MONGO_FILTER_INDEXES:
+        db['students'].create_index(keys)
+
+
+# (version, description, apply(db)). Append new migrations; never edit or reorder applied ones
+MONGO_MIGRATIONS = [
+    (1, "unique index on students.id",
+     lambda db: db['students'].create_index([('id', pymongo.ASCENDING)], unique=True)),
+    # Fails while duplicate emails exist; remove them and run --migrate again
+    (2, "unique index on students.email",
+     lambda db: db['students'].create_index([('email', pymongo.ASCENDING)], unique=True)),
+    (3, "compound indexes backing the filter bar", _create_filter_indexes),
+]
+
+
+
+class MongoSchemaStore:
+    """Schema version kept in one document of the schema_migrations collection."""
+
+    def __init__(self, db):
+        self.collection = db['schema_migrations']
+
+
+    def version(self):
+        document = self.collection.find_one({'_id': SCHEMA_NAME})
+        return document['version'] if document else 0
+
+
+    def record(self, version):
+        # $max so a client running older code can never move the version back
+        self.collection.update_one({'_id': SCHEMA_NAME}, {'$max': {'version': version}}, upsert=True)
+
+
+
+def migrate_database(db, log=print):
+    return migrate(db, MongoSchemaStore(db), MONGO_MIGRATIONS, log)
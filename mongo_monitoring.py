@@ -0,0 +1,58 @@
+import bson
+from pymongo import monitoring
+
+from slow_operations import SlowOperation, mongo_shape
+
+
+# Retried operations still waiting for their final attempt; past this many the bookkeeping is reset
+MAX_PENDING_OPERATIONS = 1000
+
+
+
+class MongoCommandMonitor(monitoring.CommandListener):
+    """Logs each slow or failed command pymongo sends, with the server that ran it.
+
+    pymongo calls the listener on the thread running the command, so the work for
+    fast commands is a dict update; shapes and sizes are only worked out for
+    commands that end up in the log. Retries of a retryable read or write share an
+    operation_id, which is how the attempts are counted.
+    """
+
+    def __init__(self, log, backend):
+        self.log = log
+        self.backend = backend
+        self._commands = {}  # request_id: command document
+        self._attempts = {}  # operation_id: commands sent so far
+
+
+    def started(self, event):
+        self._commands[event.request_id] = event.command
+        if len(self._attempts) > MAX_PENDING_OPERATIONS:
+            self._attempts.clear()
+        self._attempts[event.operation_id] = self._attempts.get(event.operation_id, 0) + 1
+
+
+    def succeeded(self, event):
+        command = self._commands.pop(event.request_id, None)
+        attempts = self._attempts.pop(event.operation_id, 1)
+        duration_ms = event.duration_micros / 1000
+        if command is not None and self.log.is_slow(duration_ms):
+            cursor = event.reply.get('cursor') or {}
+            batch = cursor.get('firstBatch', cursor.get('nextBatch'))
+            self.log.add(self.entry(event, command, attempts, duration_ms, bytes_received=len(bson.encode(event.reply)),
+                                    rows=None if batch is None else len(batch)))
+
+
+    def failed(self, event):
+        # The attempts are kept: a retry of the same operation may follow
+        command = self._commands.pop(event.request_id, None)
+        if command is not None:
+            self.log.add(self.entry(event, command, self._attempts.get(event.operation_id, 1), event.duration_micros / 1000,
+                                    error=str(event.failure.get('errmsg', event.failure))))
+
+
+    def entry(self, event, command, attempts, duration_ms, bytes_received=None, rows=None, error=None):
+        host, port = event.connection_id
+        return SlowOperation(self.backend, event.command_name, mongo_shape(command), duration_ms, f"{host}:{port}",
+                             attempts=attempts, bytes_sent=len(bson.encode(command)), bytes_received=bytes_received,
+                             rows=rows, error=error)
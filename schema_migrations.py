@@ -0,0 +1,29 @@
+# Key of the recorded schema version, in the MongoDB schema_migrations collection
+# and the Cassandra schema_migrations table
+SCHEMA_NAME = 'student_management'
+
+
+
+def latest_version(migrations):
+    return migrations[-1][0]
+
+
+
+def migrate(target, store, migrations, log=print):
+    """Apply every migration newer than the version recorded in store. Returns the number applied.
+
+    migrations is a list of (version, description, apply) in version order, where
+    apply(target) runs the migration's DDL. Each version is recorded as soon as it
+    succeeds, so a failed migration is retried from that point on the next run.
+    An up-to-date database costs a single read of the recorded version.
+    """
+    current = store.version()
+    applied = 0
+    for version, description, apply in migrations:
+        if version <= current:
+            continue
+        log(f"Applying schema migration {version}: {description}")
+        apply(target)
+        store.record(version)
+        applied += 1
+    return applied
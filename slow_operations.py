@@ -0,0 +1,117 @@
+import re
+import threading
+import time
+from collections import deque
+
+from driver_settings import env_int
+
+
+# Requests that take at least this long are logged; SLOW_OPERATION_MS in .env overrides it
+SLOW_OPERATION_MS = 100
+
+# Entries kept in the log; older ones are dropped
+SLOW_LOG_CAPACITY = 500
+
+# Query shapes longer than this are cut off
+SHAPE_MAX_LENGTH = 300
+
+# Fields the driver adds to every command
+MONGO_DRIVER_FIELDS = {'lsid', 'txnNumber', '$db', '$clusterTime', '$readPreference', 'autocommit', 'startTransaction'}
+
+# Literals in CQL text: quoted strings, numbers and uuids
+CQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}\b|(?<![\w.])-?\d+(?:\.\d+)?\b")
+
+
+
+class SlowOperation:
+    """One driver request that took at least the log's threshold, or failed.
+
+    duration_ms is the round trip the driver measured. server_ms is the time the
+    server reports having spent, when the driver can tell (a Cassandra query trace).
+    A round trip much longer than server_ms points at the network or the driver.
+    """
+
+    def __init__(self, backend, operation, shape, duration_ms, host, attempts=1, bytes_sent=None, bytes_received=None,
+                 rows=None, server_ms=None, error=None):
+        self.when = time.time()
+        self.backend = backend
+        self.operation = operation
+        self.shape = shape
+        self.duration_ms = duration_ms
+        self.server_ms = server_ms
+        self.host = host
+        self.attempts = attempts
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.rows = rows
+        self.error = error
+
+
+
+class SlowOperationLog:
+    """The most recent slow driver requests, filled by the driver monitors from any thread."""
+
+    def __init__(self, threshold_ms=SLOW_OPERATION_MS, capacity=SLOW_LOG_CAPACITY):
+        self.threshold_ms = threshold_ms
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+
+    def is_slow(self, duration_ms):
+        return duration_ms >= self.threshold_ms
+
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+
+    def entries(self):
+        """The logged requests, newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+
+def slow_operation_log():
+    return SlowOperationLog(env_int("SLOW_OPERATION_MS", SLOW_OPERATION_MS))
+
+
+
+def shorten(shape):
+    return shape if len(shape) <= SHAPE_MAX_LENGTH else shape[:SHAPE_MAX_LENGTH - 3] + "..."
+
+
+
+def mongo_shape(command):
+    """A command document with every value replaced by '?', keeping field names and operators.
+
+    The command's first field names the collection, which is kept, e.g.
+    {find: 'students', filter: {email: '?'}, limit: '?'}. Session and cluster
+    bookkeeping fields the driver adds are left out.
+    """
+    fields = [(key, value) for key, value in command.items() if key not in MONGO_DRIVER_FIELDS]
+    if not fields:
+        return "{}"
+    (name, collection), rest = fields[0], fields[1:]
+    return shorten("{" + ", ".join([f"{name}: {collection!r}"] + [f"{key}: {value_shape(value)}" for key, value in rest]) + "}")
+
+
+
+def value_shape(value):
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{key}: {value_shape(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        # Documents of a batch share a shape; the first stands for all of them
+        return f"[{value_shape(value[0])}, ...]" if value else "[]"
+    return "'?'"
+
+
+
+def cql_shape(query_string):
+    return shorten(" ".join(CQL_LITERALS.sub("?", query_string).split()))
@@ -0,0 +1,127 @@
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+
+from driver_settings import env_int
+
+
+# The GUI thread counts as stalled once it has not run its event loop for this long; UI_STALL_THRESHOLD_MS overrides it
+STALL_THRESHOLD_MS = 100
+
+# Longest interval of the heartbeat timer on the GUI thread; a stall is the time a beat is late by
+HEARTBEAT_MS = 50
+
+# A stall still going on after this long is logged straight away, in case it never ends
+HANG_MS = 5000
+
+STALL_LOG_FILE = 'ui_stalls.log'
+STALL_LOG_MAX_BYTES = 1000000
+STALL_LOG_BACKUPS = 3
+
+
+
+class StallWatchdog:
+    """Logs each time the GUI thread stops processing events for threshold_ms or longer.
+
+    A QTimer on the GUI thread beats a few times per threshold. A watchdog thread
+    checks how late the next beat is; once it is threshold_ms late, the watchdog copies
+    the GUI thread's Python stack from sys._current_frames(), so the entry names
+    the call that blocked. The stall is written to a rotating log file when the
+    beats resume. Its duration is how late the beat was, which can fall short of
+    the real stall by up to one beat interval, never exceed it.
+    """
+
+    def __init__(self, threshold_ms, log_path, max_bytes=STALL_LOG_MAX_BYTES, backups=STALL_LOG_BACKUPS):
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path
+        # The file is only created when the first stall is written
+        self.logger = logging.getLogger('student_management.ui_stalls')
+        self.logger.setLevel(logging.WARNING)
+        self.logger.propagate = False
+        self.handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups,
+                                                            encoding='utf-8', delay=True)
+        self.handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self.logger.addHandler(self.handler)
+
+        self.last_beat = time.monotonic()
+        self.longest_gap = 0.0  # Longest time between beats since the watchdog last looked, in seconds
+        self.stall_stack = None  # GUI thread stack captured during the current stall
+        self.hang_logged = False
+        self.timer = None
+        self._stopped = threading.Event()
+
+
+    def start(self):
+        """Starts the heartbeat and the watchdog thread; call on the GUI thread once the QApplication exists."""
+        from PyQt5.QtCore import QTimer
+
+        self.gui_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.heartbeat_ms = min(max(self.threshold_ms // 4, 10), HEARTBEAT_MS)
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.beat)
+        self.timer.start(self.heartbeat_ms)
+        # Checking twice per threshold catches a stall within 1.5 thresholds of it starting
+        self.check_seconds = max(self.threshold_ms / 2, 10) / 1000
+        threading.Thread(target=self.run, name='ui-stall-watchdog', daemon=True).start()
+
+
+    def stop(self):
+        self._stopped.set()
+        if self.timer is not None:
+            self.timer.stop()
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+
+    def beat(self):
+        now = time.monotonic()
+        self.longest_gap = max(self.longest_gap, now - self.last_beat)
+        self.last_beat = now
+
+
+    def run(self):
+        while not self._stopped.wait(self.check_seconds):
+            self.check()
+
+
+    def check(self):
+        late_ms = (time.monotonic() - self.last_beat) * 1000 - self.heartbeat_ms
+        if late_ms >= self.threshold_ms:
+            # Still stalled: the first look takes the stack, which is inside the blocking call
+            if self.stall_stack is None:
+                self.stall_stack = self.gui_thread_stack()
+            if late_ms >= HANG_MS and not self.hang_logged:
+                self.hang_logged = True
+                self.logger.warning("UI thread stalled for %.0f ms so far, still blocked at:\n%s", late_ms, self.stall_stack)
+            return
+
+        # The beats are back; a stall shorter than a check interval is only seen in the longest gap
+        stall_ms = self.longest_gap * 1000 - self.heartbeat_ms
+        self.longest_gap = 0.0
+        if stall_ms >= self.threshold_ms:
+            stack = self.stall_stack or "  (ended before its stack could be captured)\n"
+            self.logger.warning("UI thread stalled for %.0f ms at:\n%s", stall_ms, stack)
+        self.stall_stack = None
+        self.hang_logged = False
+
+
+    def gui_thread_stack(self):
+        frame = sys._current_frames().get(self.gui_thread_id)
+        return "".join(traceback.format_stack(frame)) if frame is not None else "  (GUI thread not found)\n"
+
+
+
+def stall_watchdog():
+    """The watchdog configured in the environment, or None if UI_STALL_THRESHOLD_MS is 0."""
+    threshold_ms = env_int("UI_STALL_THRESHOLD_MS", STALL_THRESHOLD_MS)
+    log_path = os.getenv("UI_STALL_LOG", "").strip() or STALL_LOG_FILE
+    max_bytes = env_int("UI_STALL_LOG_MAX_BYTES", STALL_LOG_MAX_BYTES, minimum=1)
+    backups = env_int("UI_STALL_LOG_BACKUPS", STALL_LOG_BACKUPS)
+    if not threshold_ms:
+        return None
+    return StallWatchdog(threshold_ms, log_path, max_bytes, backups)
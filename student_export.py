@@ -0,0 +1,70 @@
+import csv
+import json
+import time
+
+from student_import import open_text
+from student_validation import COLUMNS
+
+
+# Rows between progress callbacks
+PROGRESS_EVERY = 5000
+
+# Rows fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+# Write buffer for uncompressed output; gzip output is buffered by the compressor
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+
+class ExportReport:
+
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+
+    def rows_per_sec(self):
+        return self.written / self.elapsed if self.elapsed else 0.0
+
+
+    def summary(self):
+        return (f"Exported {self.written} rows to {self.path} in {self.elapsed:.1f}s "
+                f"({self.rows_per_sec():.0f} rows/sec)")
+
+
+
+def print_progress(report):
+    print(f"\r{report.written} rows exported ({report.rows_per_sec():.0f} rows/sec)", end='', flush=True)
+
+
+
+def export_students(records, path, progress=None):
+    """Write records to a CSV or JSONL file (gzip-compressed if path ends in .gz) as they arrive.
+
+    records is consumed one at a time, so a Mongo cursor or paged Cassandra result
+    is never materialised; only the driver's current batch is held in memory.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    if not name.endswith(('.csv', '.jsonl', '.json')):
+        raise ValueError(f"Unsupported file type: {path} (expected .csv or .jsonl)")
+
+    report = ExportReport(path)
+    with open_text(path, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+        if name.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            write = lambda record: f.write(json.dumps({field: record[field] for field in COLUMNS}) + '\n')
+
+        for record in records:
+            write(record)
+            report.written += 1
+            if progress is not None and report.written % PROGRESS_EVERY == 0:
+                report.elapsed = time.perf_counter() - report.started
+                progress(report)
+    report.elapsed = time.perf_counter() - report.started
+    return report
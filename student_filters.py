@@ -0,0 +1,158 @@
+import re
+from datetime import date
+
+
+# Indexes backing each filter shape. Equality fields come before the dob range so
+# stream/gender/dob combinations are answered by a single index scan
+MONGO_FILTER_INDEXES = [
+    [('name', 1)],
+    [('stream', 1), ('gender', 1), ('dob', 1)],
+    [('gender', 1), ('dob', 1)],
+    [('dob', 1)],
+]
+
+# Server-side time limit on a filtered query, so a superseded search cannot run on
+SEARCH_TIMEOUT_MS = 5000
+
+
+
+def name_bucket(name):
+    # Partition of students_by_name holding every name that starts with name's first letter
+    return name[:1].lower()
+
+
+
+def prefix_upper_bound(prefix):
+    # Smallest string greater than every string starting with prefix
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+
+class StudentFilter:
+    """Criteria from the filter bar. Empty fields match everything; dob bounds are inclusive ISO dates."""
+
+    def __init__(self, name_prefix='', stream='', gender='', dob_from='', dob_to=''):
+        self.name_prefix = name_prefix
+        self.stream = stream
+        self.gender = gender
+        self.dob_from = dob_from
+        self.dob_to = dob_to
+
+
+    def __eq__(self, other):
+        return isinstance(other, StudentFilter) and vars(self) == vars(other)
+
+
+    def is_empty(self):
+        return not any(vars(self).values())
+
+
+    def describe(self):
+        parts = []
+        if self.name_prefix:
+            parts.append(f"name starts with '{self.name_prefix}'")
+        if self.stream:
+            parts.append(f"stream {self.stream}")
+        if self.gender:
+            parts.append(self.gender.lower())
+        if self.dob_from:
+            parts.append(f"born on or after {self.dob_from}")
+        if self.dob_to:
+            parts.append(f"born on or before {self.dob_to}")
+        return ", ".join(parts) or "no filter, all students"
+
+
+    def narrows(self, other):
+        """True if every record matching self also matches other: a longer name prefix, all else equal."""
+        return (self.name_prefix.startswith(other.name_prefix) and
+                (self.stream, self.gender, self.dob_from, self.dob_to) == (other.stream, other.gender, other.dob_from, other.dob_to))
+
+
+    def matches(self, record):
+        """Evaluate the filter against a record already in memory (same semantics as the queries)."""
+        if self.name_prefix and not record['name'].startswith(self.name_prefix):
+            return False
+        if self.stream and record['stream'] != self.stream:
+            return False
+        if self.gender and record['gender'] != self.gender:
+            return False
+        if self.dob_from and record['dob'] < self.dob_from:
+            return False
+        if self.dob_to and record['dob'] > self.dob_to:
+            return False
+        return True
+
+
+    def mongo_query(self):
+        query = {}
+        if self.name_prefix:
+            # An anchored, case-sensitive regex becomes a range scan on the name index
+            query['name'] = {'$regex': '^' + re.escape(self.name_prefix)}
+        if self.stream:
+            query['stream'] = self.stream
+        if self.gender:
+            query['gender'] = self.gender
+        dob = {}
+        if self.dob_from:
+            dob['$gte'] = self.dob_from  # dob is stored as YYYY-MM-DD, which sorts as a date
+        if self.dob_to:
+            dob['$lte'] = self.dob_to
+        if dob:
+            query['dob'] = dob
+        return query
+
+
+    def cassandra_query(self):
+        """Compile to (cql, params, residual) for the students or students_by_name table.
+
+        residual is a StudentFilter for criteria that cannot be pushed into the same
+        query as a name prefix and are applied to the rows of that single partition.
+        """
+        if self.name_prefix:
+            cql = "SELECT * FROM students_by_name WHERE bucket = ? AND name >= ? AND name < ?"
+            params = (name_bucket(self.name_prefix), self.name_prefix, prefix_upper_bound(self.name_prefix))
+            residual = StudentFilter(stream=self.stream, gender=self.gender, dob_from=self.dob_from, dob_to=self.dob_to)
+            return cql, params, None if residual.is_empty() else residual
+
+        conditions = []
+        params = []
+        if self.stream:
+            conditions.append("stream = ?")
+            params.append(self.stream)
+        if self.gender:
+            conditions.append("gender = ?")
+            params.append(self.gender)
+        if self.dob_from:
+            conditions.append("dob >= ?")
+            params.append(date.fromisoformat(self.dob_from))
+        if self.dob_to:
+            conditions.append("dob <= ?")
+            params.append(date.fromisoformat(self.dob_to))
+        return "SELECT * FROM students WHERE " + " AND ".join(conditions), tuple(params), None
+
+
+    def describe_cassandra_plan(self):
+        cql, params, residual = self.cassandra_query()
+        if self.name_prefix:
+            lines = [f"Single-partition slice of students_by_name (bucket '{params[0]}')"]
+            if residual is not None:
+                checked = [field for field in ('stream', 'gender', 'dob_from', 'dob_to') if getattr(residual, field)]
+                lines.append(f"Then {', '.join(checked)} checked on the rows of that partition")
+        else:
+            indexes = [f"students_{column}_sai" for column, value in
+                       (('stream', self.stream), ('gender', self.gender), ('dob', self.dob_from or self.dob_to)) if value]
+            lines = ["Storage-attached index query using " + ", ".join(indexes)]
+        return "\n".join(lines + ["", cql, f"params: {params}"])
+
+
+
+def describe_mongo_plan(explain):
+    """One-line summary of the winning plan from cursor.explain(), e.g. 'FETCH <- IXSCAN name_1'."""
+    stages = []
+    stage = explain.get('queryPlanner', {}).get('winningPlan', {})
+    # Newer servers nest the classic plan under queryPlan
+    stage = stage.get('queryPlan', stage)
+    while stage:
+        stages.append(stage.get('stage', '?') + (f" {stage['indexName']}" if 'indexName' in stage else ''))
+        stage = stage.get('inputStage') or (stage.get('inputStages') or [None])[0]
+    return " <- ".join(stages)
@@ -0,0 +1,238 @@
+import csv
+import gzip
+import json
+import time
+from itertools import islice
+
+from student_validation import RECORD_FIELDS, validate_record
+
+
+# Rejected rows kept for the report; the rest are only counted so memory stays flat
+MAX_REJECT_SAMPLES = 100
+
+
+
+class ImportReport:
+
+    def __init__(self, path):
+        self.path = path
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.rejects = []  # (line number, reason), capped at MAX_REJECT_SAMPLES
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+
+    def reject(self, line_no, reason):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REJECT_SAMPLES:
+            self.rejects.append((line_no, reason))
+
+
+    def rows_per_sec(self):
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+    def summary(self, max_rejects=MAX_REJECT_SAMPLES):
+        lines = [f"Imported {self.inserted} of {self.read} rows from {self.path} in {self.elapsed:.1f}s "
+                 f"({self.rows_per_sec():.0f} rows/sec), {self.rejected} rejected"]
+        shown = self.rejects[:max_rejects]
+        lines += [f"  line {line_no}: {reason}" for line_no, reason in shown]
+        if self.rejected > len(shown):
+            lines.append(f"  ... and {self.rejected - len(shown)} more")
+        return "\n".join(lines)
+
+
+
+def print_progress(report):
+    print(f"\r{report.read} rows read, {report.inserted} imported, {report.rejected} rejected "
+          f"({report.rows_per_sec():.0f} rows/sec)", end='', flush=True)
+
+
+
+def open_text(path, mode='r', buffering=-1):
+    # Files ending in .gz are (de)compressed on the fly
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, buffering=buffering, encoding='utf-8', newline='')
+
+
+
+def read_rows(path):
+    """Yield (line number, row dict, None) from a CSV or JSONL file, one row at a time.
+
+    A line that cannot be parsed into a row yields (line number, None, reason)
+    instead, so one malformed line is rejected rather than ending the import.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    with open_text(path) as f:
+        if name.endswith('.csv'):
+            reader = csv.DictReader(f)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    # The reader carries on with the next line after a malformed one, without counting it
+                    yield reader.line_num + 1, None, f"Malformed CSV: {e}"
+                    continue
+                yield reader.line_num, row, None
+        elif name.endswith(('.jsonl', '.json')):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_no, None, f"Malformed JSON: {e}"
+                    continue
+                if isinstance(row, dict):
+                    yield line_no, row, None
+                else:
+                    yield line_no, None, f"Expected a JSON object, not {type(row).__name__}"
+        else:
+            raise ValueError(f"Unsupported file type: {path} (expected .csv or .jsonl)")
+
+
+
+def to_record(row):
+    # Column names match the grid's record keys; 'id' is ignored and assigned on insert
+    return {field: str(row.get(field) or '').strip() for field in RECORD_FIELDS}
+
+
+
+def import_students(path, writer, batch_size=1000, progress=None):
+    """Stream students from path into the database through writer, batch_size rows at a time.
+
+    Rows failing the GUI's validation rules are rejected before they reach the
+    database; writer rejects rows the database refuses (e.g. duplicate emails).
+    progress, if given, is called with the report after every batch.
+    """
+    report = ImportReport(path)
+    valid = _valid_records(read_rows(path), report)
+    while True:
+        batch = list(islice(valid, batch_size))
+        if not batch:
+            break
+        line_numbers = [line_no for line_no, _ in batch]
+        rejected = writer.write([record for _, record in batch])
+        for position, reason in rejected:
+            report.reject(line_numbers[position], reason)
+        report.inserted += len(batch) - len(rejected)
+        report.elapsed = time.perf_counter() - report.started
+        if progress is not None:
+            progress(report)
+    report.elapsed = time.perf_counter() - report.started
+    return report
+
+
+
+def _valid_records(rows, report):
+    for line_no, row, reason in rows:
+        report.read += 1
+        if reason:
+            report.reject(line_no, reason)
+            continue
+        record = to_record(row)
+        reason = validate_record(record)
+        if reason:
+            report.reject(line_no, reason)
+        else:
+            yield line_no, record
+
+
+
+class MongoStudentWriter:
+    """Inserts each batch with one unordered insert_many; the unique email index rejects duplicates.
+
+    Without that index (check_emails), each batch's emails are looked up with one
+    $in query first, and rows whose email is taken or repeated are rejected.
+    """
+
+    def __init__(self, collection, id_sequence, check_emails=False):
+        self.collection = collection
+        self.id_sequence = id_sequence
+        self.check_emails = check_emails
+
+
+    def write(self, records):
+        from pymongo.errors import BulkWriteError
+
+        positions, rejected = list(range(len(records))), []
+        if self.check_emails:
+            positions, rejected = self._drop_used_emails(records)
+            if not positions:
+                return rejected
+
+        ids = self.id_sequence.reserve(len(positions))
+        documents = [{'id': record_id, **records[position]} for record_id, position in zip(ids, positions)]
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            rejected += [(positions[error['index']], self._reason(error)) for error in e.details['writeErrors']]
+        return rejected
+
+
+    def _drop_used_emails(self, records):
+        """Positions of the records left to insert, and (position, reason) for the rejected ones."""
+        emails = list({record['email'] for record in records})
+        used = {document['email'] for document in self.collection.find({'email': {'$in': emails}}, {'email': 1, '_id': 0})}
+        kept, rejected = [], []
+        for position, record in enumerate(records):
+            if record['email'] in used:
+                rejected.append((position, "Email already exists! Please enter a unique email."))
+            else:
+                used.add(record['email'])
+                kept.append(position)
+        return kept, rejected
+
+
+    def _reason(self, error):
+        if error.get('code') == 11000:
+            return "Email already exists! Please enter a unique email."
+        return error.get('errmsg', 'Write failed')
+
+
+
+class CassandraStudentWriter:
+    """Claims each batch's emails and inserts the rows (with their students_by_name copies) concurrently."""
+
+    def __init__(self, session, statements, id_sequence, concurrency=100):
+        self.session = session
+        self.statements = statements
+        self.id_sequence = id_sequence
+        self.concurrency = concurrency
+
+
+    def write(self, records):
+        from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+        from cassandra_email_lookup import release_email
+        from cassandra_name_lookup import student_insert_batch
+
+        ids = self.id_sequence.reserve(len(records))
+        records = [{'id': record_id, **record} for record_id, record in zip(ids, records)]
+
+        rejected = []
+        claimed = []
+        claims = execute_concurrent_with_args(
+            self.session, self.statements.get('claim_email'),
+            [(record['email'], record['id']) for record in records],
+            concurrency=self.concurrency, raise_on_first_error=False)
+        for position, (record, (success, result)) in enumerate(zip(records, claims)):
+            if not success:
+                rejected.append((position, f'An error occurred: {result}'))
+            elif not result.was_applied:
+                rejected.append((position, "Email already exists! Please enter a unique email."))
+            else:
+                claimed.append((position, record))
+
+        inserts = execute_concurrent(
+            self.session, [(student_insert_batch(self.statements, record), None) for _, record in claimed],
+            concurrency=self.concurrency, raise_on_first_error=False)
+        for (position, record), (success, result) in zip(claimed, inserts):
+            if not success:
+                release_email(self.statements, record['email'], record['id'])
+                rejected.append((position, f'An error occurred: {result}'))
+        return rejected
@@ -0,0 +1,145 @@
+"""Student Management System, on local MongoDB, MongoDB Atlas, local Cassandra or AstraDB.
+
+    python student_management.py --backend atlas
+    python student_management.py --backend cassandra --import students.csv.gz
+
+The backend defaults to STUDENT_DB_BACKEND from .env, else local MongoDB. Only the
+chosen backend's driver is imported, and PyQt5 widgets only when the window opens.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from schema_migrations import latest_version
+from driver_settings import DriverSettingsError, env_int
+from stall_watchdog import stall_watchdog
+
+
+# Backend name: (module, factory). Modules are imported on demand, so only the chosen driver is loaded
+BACKENDS = {
+    'mongodb': ('mongo_backend', 'local_backend'),
+    'atlas': ('mongo_backend', 'atlas_backend'),
+    'cassandra': ('cassandra_backend', 'local_backend'),
+    'astra': ('cassandra_backend', 'astra_backend'),
+}
+
+DEFAULT_BACKEND = 'mongodb'
+
+
+
+def load_backend(name):
+    module_name, factory = BACKENDS[name]
+    return getattr(importlib.import_module(module_name), factory)()
+
+
+
+def parse_args(argv, default_backend):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=default_backend,
+                        help=f"database to use (default: {default_backend})")
+    parser.add_argument('--migrate', action='store_true',
+                        help="apply pending schema migrations (tables and indexes), then exit")
+    parser.add_argument('--backfill-emails', action='store_true',
+                        help="Cassandra: claim the email of every existing student in students_by_email, then exit")
+    parser.add_argument('--backfill-names', action='store_true',
+                        help="Cassandra: copy every existing student into students_by_name for name search, then exit")
+    parser.add_argument('--import', dest='import_path', metavar='FILE',
+                        help="import students from a CSV or JSONL file (optionally .gz), then exit")
+    parser.add_argument('--export', dest='export_path', metavar='FILE',
+                        help="export all students to a CSV or JSONL file (gzip-compressed if FILE ends in .gz), then exit")
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help="on exit, write per-operation latency histograms to FILE (JSON if it ends in .json, else Prometheus text)")
+    args, qt_args = parser.parse_known_args(argv)
+    if (args.backfill_emails or args.backfill_names) and BACKENDS[args.backend][0] != 'cassandra_backend':
+        parser.error("--backfill-emails and --backfill-names need a Cassandra backend")
+    return args, qt_args
+
+
+
+def run_command(backend, args):
+    """Runs the headless command chosen in args and returns the exit status."""
+    from student_import import import_students, print_progress
+    from student_export import export_students, print_progress as print_export_progress
+
+    if args.migrate:
+        backend.open()
+        applied = backend.migrate()
+        print(f"Applied {applied} migration(s), schema is at version {latest_version(backend.migrations)}")
+        return 0
+
+    backend.start()
+
+    if args.backfill_emails:
+        claimed, conflicts = backend.backfill_emails()
+        print(f"Claimed {claimed} emails in students_by_email")
+        for record_id, email, owner_id in conflicts:
+            print(f"Duplicate email {email} on student {record_id} (already owned by student {owner_id})")
+        return 1 if conflicts else 0
+
+    if args.backfill_names:
+        copied = backend.backfill_names()
+        print(f"Copied {copied} students into students_by_name")
+        return 0
+
+    if args.import_path:
+        report = import_students(args.import_path, backend.student_writer(), progress=print_progress)
+    else:
+        report = export_students(backend.export_records(), args.export_path, progress=print_export_progress)
+    print()
+    print(report.summary())
+    return 0
+
+
+
+def run_window(backend, qt_args, watchdog, worker_threads):
+    from PyQt5.QtWidgets import QApplication
+    from student_window import StudentManagementSystem
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    if watchdog is not None:
+        # Started before the window is built, so a slow startup is logged as well
+        watchdog.start()
+    try:
+        window = StudentManagementSystem(backend, worker_threads)
+        return app.exec_()
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
+
+
+
+def main(default_backend=None, argv=None):
+    # Load environment variables from file
+    load_dotenv('.env')
+
+    default_backend = default_backend or os.getenv("STUDENT_DB_BACKEND", DEFAULT_BACKEND)
+    if default_backend not in BACKENDS:
+        sys.exit(f"STUDENT_DB_BACKEND must be one of {', '.join(sorted(BACKENDS))}, not {default_backend!r}")
+    args, qt_args = parse_args(argv, default_backend)
+    try:
+        # Driver and monitoring settings are read and validated here, before anything connects
+        backend = load_backend(args.backend)
+        watchdog = stall_watchdog()
+        worker_threads = env_int("DB_WORKER_THREADS", minimum=1)  # None keeps the window's default
+    except DriverSettingsError as e:
+        sys.exit(f"Invalid setting: {e}")
+
+    try:
+        if not (args.migrate or args.backfill_emails or args.backfill_names or args.import_path or args.export_path):
+            return run_window(backend, qt_args, watchdog, worker_threads)
+        try:
+            return run_command(backend, args)
+        finally:
+            backend.close()
+    finally:
+        if args.metrics_file:
+            backend.metrics.dump(args.metrics_file)
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+from itertools import islice
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from student_validation import COLUMNS
+
+
+HEADERS = ["Student ID", "Name", "Email Address", "Contact Number", "Gender", "Date of Birth", "Stream"]
+
+
+
+class StudentTableModel(QAbstractTableModel):
+    """Table model that pulls student records from a source iterator only as the view scrolls.
+
+    The source yields plain dicts keyed by COLUMNS (a Mongo cursor, or a generator
+    over a paged Cassandra result). Nothing is read until the view asks for it.
+    When an executor is given, each batch is read on a worker thread and appended
+    once it arrives, so scrolling never blocks the GUI thread on a round trip.
+    """
+
+    def __init__(self, batch_size=200, executor=None, parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self.executor = executor
+        self._records = []
+        self._rows_by_id = {}
+        self._source = iter(())
+        self._exhausted = True
+        self._fetching = False
+        self._generation = 0
+
+
+    def set_source(self, source):
+        self._reset([], iter(source), exhausted=False)
+
+
+    def set_records(self, records):
+        """Show exactly these records (e.g. one page), with nothing further to fetch."""
+        self._reset(list(records), iter(()), exhausted=True)
+
+
+    def _reset(self, records, source, exhausted):
+        self.beginResetModel()
+        if not self._fetching:
+            # An in-flight batch closes its own source once it comes back stale
+            self._close_source(self._source)
+        self._records = records
+        self._rows_by_id = {record['id']: row for row, record in enumerate(records)}
+        self._source = source
+        self._exhausted = exhausted
+        self._fetching = False
+        self._generation += 1
+        self.endResetModel()
+
+
+    def _close_source(self, source):
+        # Release the server-side cursor of the previous query, if any. Closing a
+        # Mongo cursor is a killCursors round trip, so it runs on a worker too
+        close = getattr(source, 'close', None)
+        if close is None:
+            return
+        if self.executor is None:
+            close()
+        else:
+            self.executor.submit(close, on_error=lambda error: print("Could not close the previous result: %s" % error))
+
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._records)
+
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(COLUMNS)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        if role == Qt.DisplayRole:
+            return str(record[COLUMNS[index.column()]])
+        if role == Qt.TextAlignmentRole:
+            # Align text in each cell to the center
+            return Qt.AlignCenter
+        return None
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetching:
+            return
+        if self.executor is None:
+            self._append_batch(self._generation, self._source, self._read_batch(self._source))
+            return
+        self._fetching = True
+        generation, source = self._generation, self._source
+        self.executor.submit(self._read_batch, source,
+                             on_result=lambda batch: self._append_batch(generation, source, batch),
+                             on_error=lambda error: self._fetch_failed(generation, error))
+
+
+    def _read_batch(self, source):
+        return list(islice(source, self.batch_size))
+
+
+    def _fetch_failed(self, generation, error):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._exhausted = True
+        self.executor.job_failed.emit(error)
+
+
+    def _append_batch(self, generation, source, batch):
+        if generation != self._generation:
+            # The model was reset while this batch was in flight
+            self._close_source(source)
+            return
+        self._fetching = False
+        if len(batch) < self.batch_size:
+            self._exhausted = True
+        # Skip records already patched in locally before their batch was read
+        batch = [record for record in batch if record['id'] not in self._rows_by_id]
+        if not batch:
+            return
+        first = len(self._records)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        for row, record in enumerate(batch, first):
+            self._rows_by_id[record['id']] = row
+        self._records.extend(batch)
+        self.endInsertRows()
+
+
+    def record_at(self, row):
+        return self._records[row]
+
+
+    def record_for_id(self, record_id):
+        """The loaded record with this id, or None if it is not in the grid."""
+        row = self._rows_by_id.get(record_id)
+        return None if row is None else self._records[row]
+
+
+    def records(self):
+        """The records loaded so far, in row order."""
+        return list(self._records)
+
+
+    def append_record(self, record):
+        if record['id'] in self._rows_by_id:
+            self.replace_record(record)
+            return
+        row = len(self._records)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows_by_id[record['id']] = row
+        self._records.append(record)
+        self.endInsertRows()
+
+
+    def replace_record(self, record):
+        row = self._rows_by_id.get(record['id'])
+        if row is None or self._records[row] == record:
+            return
+        self._records[row] = record
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+
+    def remove_record_ids(self, record_ids):
+        rows = sorted(self._rows_by_id[record_id] for record_id in record_ids if record_id in self._rows_by_id)
+        if not rows:
+            return
+        # One removal per contiguous run of rows, bottom run first so the rows above keep their positions
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._records[first:last + 1]
+            self.endRemoveRows()
+        self._rows_by_id = {record['id']: row for row, record in enumerate(self._records)}
@@ -0,0 +1,49 @@
+import re
+from datetime import date
+
+
+# Fields every student record must carry, besides the id assigned on insert
+RECORD_FIELDS = ('name', 'email', 'phone_no', 'gender', 'dob', 'stream')
+
+# Record keys in display order, shared by every backend
+COLUMNS = ('id',) + RECORD_FIELDS
+
+
+
+class RecordError(Exception):
+    """Raised by a database job for a failure that should be shown to the user as-is."""
+
+
+
+def is_valid_phone_number(phone):
+    if len(phone) != 10:
+        return False
+    if not re.match("^[0-9]+$", phone):
+        return False
+    return True
+
+
+
+def is_valid_email(email):
+    pattern =  r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
+    return re.match(pattern, email) is not None
+
+
+
+def validate_record(record):
+    """Return the reason record would be rejected by the GUI form, or None if it is valid."""
+    # Check if any field is empty
+    if any(not record.get(field) for field in RECORD_FIELDS):
+        return "Please fill all the missing fields!!"
+
+    if not is_valid_email(record['email']):
+        return "Please enter a valid email address."
+
+    if not is_valid_phone_number(record['phone_no']):
+        return "Please enter a valid 10-digit phone number."
+
+    try:
+        date.fromisoformat(record['dob'])
+    except ValueError:
+        return "Please enter the date of birth as YYYY-MM-DD."
+    return None
@@ -0,0 +1,877 @@
+import os
+
+from PyQt5.QtWidgets import QMainWindow, QLabel, QLineEdit, QPushButton, QComboBox, QDateEdit, QTableView, QHeaderView, QWidget, QScrollArea, QMessageBox, QProgressBar, QFileDialog, QCheckBox
+from PyQt5.QtCore import Qt, QDate, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QIntValidator  
+
+from student_table_model import StudentTableModel
+from db_worker import DbExecutor
+from student_validation import RecordError
+import student_validation
+from student_import import import_students
+from student_export import export_students
+from bulk_edit_dialog import BulkEditDialog
+from diagnostics_dialog import DiagnosticsDialog
+from student_filters import StudentFilter
+
+
+headlabelfont = QFont("Noto Sans CJK TC", 15, QFont.Bold)  
+labelfont = QFont('Calibri', 13, QFont.Bold) 
+entryfont = QFont('Arial', 12) 
+buttonfont = QFont('Calibri', 13, QFont.Bold)  
+
+# Typing pause before the name box queries the server; narrowing the loaded rows does not wait
+SEARCH_DEBOUNCE_MS = 75
+
+# Wait before connecting again after the database could not be reached
+CONNECT_RETRY_MS = 10000
+
+
+
+class StudentManagementSystem(QMainWindow):
+    """The student management window, for any backend.
+
+    backend is a MongoBackend or CassandraBackend; every database call goes through
+    it on the worker pool, and the window only keeps the rows it shows.
+    """
+
+    # Emitted from the worker thread running an import or export, delivered on the GUI thread
+    import_progress = pyqtSignal(object)
+    export_progress = pyqtSignal(object)
+
+    def __init__(self, backend, worker_threads=None):
+        super().__init__()
+        self.backend = backend
+
+        self.setWindowTitle(f'Student Management System - {backend.description}')
+        self.setGeometry(100, 100, 1440, 600)
+
+        # Disable maximize button and window resizing
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowMaximizeButtonHint)
+        self.setFixedSize(1440, 600)  # Set fixed window size
+
+        # Database calls run on a worker pool so a slow round trip never freezes the window
+        self.executor = DbExecutor(worker_threads, parent=self)
+        self.executor.job_failed.connect(self.show_job_error)
+
+        # Re-read each written record in the background and correct its row if it drifted
+        self.verify_writes = os.getenv("VERIFY_WRITES", "false").lower() in ("1", "true", "yes")
+        
+        self.initUI()
+
+
+    def initUI(self):
+        # The window is shown straight away; connecting, checking the schema and preparing run on a worker
+        self.connected = False
+        self.connecting = False
+        # One timer for every automatic retry, so a manual Retry never starts a second chain
+        self.connect_retry_timer = QTimer(self)
+        self.connect_retry_timer.setSingleShot(True)
+        self.connect_retry_timer.setInterval(CONNECT_RETRY_MS)
+        self.connect_retry_timer.timeout.connect(self.connect_in_background)
+        self.setupUI()
+        self.set_database_actions_enabled(False)
+        self.connect_in_background()
+
+
+    def setupUI(self):
+        self.head_label = QLabel("STUDENT MANAGEMENT SYSTEM", self)
+        head_label_font = QFont("Noto Sans CJK TC", 15, QFont.Bold)
+        self.head_label.setFont(head_label_font)
+        self.head_label.setStyleSheet("background-color: blue; color: white;")
+        self.head_label.setAlignment(Qt.AlignCenter)
+        self.head_label.setGeometry(0, 0, 1430, 30)  # Adjusted width to occupy the full header space
+
+        self.left_frame = QWidget(self)
+        self.left_frame.setGeometry(0, 30, 250, 545)
+
+        self.center_frame = QWidget(self)
+        self.center_frame.setGeometry(250, 30, 250, 545)
+
+        self.filter_frame = QWidget(self)
+        self.filter_frame.setGeometry(500, 35, 920, 30)
+
+        self.right_frame = QScrollArea(self)
+        self.right_frame.setGeometry(500, 70, 920, 470)
+
+        self.page_frame = QWidget(self)
+        self.page_frame.setGeometry(500, 545, 920, 30)
+
+        self.setup_left_frame()
+        self.setup_center_frame()
+        self.setup_filter_frame()
+        self.setup_page_frame()
+        self.setup_right_frame()
+        self.setup_status_bar()
+
+        self.show()
+
+
+    def setup_left_frame(self):
+        label_name = QLabel("Name", self.left_frame)
+        label_name.setFont(labelfont)
+        label_name.setGeometry(25, 30, 100, 30)
+
+        self.name_entry = QLineEdit(self.left_frame)
+        self.name_entry.setFont(entryfont)
+        self.name_entry.setGeometry(25, 65, 230, 30)
+
+        label_contact = QLabel("Contact Number", self.left_frame)
+        label_contact.setFont(labelfont)
+        label_contact.setGeometry(25, 110, 200, 30)
+
+        self.contact_entry = QLineEdit(self.left_frame)
+        self.contact_entry.setFont(entryfont)
+        self.contact_entry.setGeometry(25, 145, 230, 30)
+
+        label_email = QLabel("Email Address", self.left_frame)
+        label_email.setFont(labelfont)
+        label_email.setGeometry(25, 190, 200, 30)
+
+        self.email_entry = QLineEdit(self.left_frame)
+        self.email_entry.setFont(entryfont)
+        self.email_entry.setGeometry(25, 225, 230, 30)
+
+        label_gender = QLabel("Gender", self.left_frame)
+        label_gender.setFont(labelfont)
+        label_gender.setGeometry(25, 270, 200, 30)
+
+        self.gender_entry = QComboBox(self.left_frame)
+        self.gender_entry.setFont(entryfont)
+        self.gender_entry.addItems(["Male", "Female"])
+        self.gender_entry.setGeometry(25, 305, 230, 30)
+
+        label_dob = QLabel("Date of Birth (DOB)", self.left_frame)
+        label_dob.setFont(labelfont)
+        label_dob.setGeometry(25, 350, 200, 30)
+
+        self.dob_entry = QDateEdit(self.left_frame)
+        self.dob_entry.setFont(entryfont)
+        self.dob_entry.setDisplayFormat("yyyy-MM-dd")
+        self.dob_entry.setGeometry(25, 385, 230, 30)
+
+        label_stream = QLabel("Stream", self.left_frame)
+        label_stream.setFont(labelfont)
+        label_stream.setGeometry(25, 430, 200, 30)
+
+        self.stream_entry = QLineEdit(self.left_frame)
+        self.stream_entry.setFont(entryfont)
+        self.stream_entry.setGeometry(25, 465, 230, 30)
+
+
+    def setup_center_frame(self):
+        self.button_add_record = QPushButton("Add Record", self.center_frame)
+        self.button_add_record.setFont(buttonfont)
+        self.button_add_record.clicked.connect(self.add_record)
+        self.button_add_record.setGeometry(45, 60, 180, 40)
+
+        self.button_delete_record = QPushButton("Delete Record", self.center_frame)
+        self.button_delete_record.setFont(buttonfont)
+        self.button_delete_record.clicked.connect(self.remove_record)
+        self.button_delete_record.setGeometry(45, 120, 180, 40)
+
+        self.button_view_record = QPushButton("View Record", self.center_frame)
+        self.button_view_record.setFont(buttonfont)
+        self.button_view_record.clicked.connect(self.view_record)
+        self.button_view_record.setGeometry(45, 180, 180, 40)
+
+        self.button_update_record = QPushButton("Update Record", self.center_frame)
+        self.button_update_record.setFont(buttonfont)
+        self.button_update_record.clicked.connect(self.update_record)
+        self.button_update_record.setGeometry(45, 240, 180, 40)
+
+        self.button_bulk_update = QPushButton("Bulk Update", self.center_frame)
+        self.button_bulk_update.setFont(buttonfont)
+        self.button_bulk_update.clicked.connect(self.bulk_update)
+        self.button_bulk_update.setGeometry(45, 300, 180, 40)
+
+        self.button_reset_fields = QPushButton("Reset Fields", self.center_frame)
+        self.button_reset_fields.setFont(buttonfont)
+        self.button_reset_fields.clicked.connect(self.reset_fields)
+        self.button_reset_fields.setGeometry(45, 360, 180, 40)
+
+        self.button_import_records = QPushButton("Import Records", self.center_frame)
+        self.button_import_records.setFont(buttonfont)
+        self.button_import_records.clicked.connect(self.import_records)
+        self.button_import_records.setGeometry(45, 420, 180, 40)
+
+        self.button_export_records = QPushButton("Export Records", self.center_frame)
+        self.button_export_records.setFont(buttonfont)
+        self.button_export_records.clicked.connect(self.export_records)
+        self.button_export_records.setGeometry(45, 480, 180, 40)
+
+        # Set the button colors 
+        button_style = "QPushButton { background-color: %s; color: white; font: bold; }"
+        self.button_add_record.setStyleSheet(button_style % 'green')
+        self.button_delete_record.setStyleSheet(button_style % 'red')
+        self.button_view_record.setStyleSheet(button_style % 'blue')
+        self.button_update_record.setStyleSheet(button_style % 'orange')
+        self.button_bulk_update.setStyleSheet(button_style % 'chocolate')
+        self.button_reset_fields.setStyleSheet(button_style % 'gray')
+        self.button_import_records.setStyleSheet(button_style % 'purple')
+        self.button_export_records.setStyleSheet(button_style % 'teal')
+
+
+    def setup_right_frame(self):
+        # Rows are pulled from the database by the model only as the view scrolls
+        self.model = StudentTableModel(executor=self.executor)
+        self.tree = QTableView(self.right_frame)
+        self.tree.setModel(self.model)
+        
+         # Set the font for the header labels to be bold
+        header_font = QFont()
+        header_font.setBold(True)
+        header = self.tree.horizontalHeader()
+        for i in range(self.model.columnCount()):
+            header.setSectionResizeMode(i, QHeaderView.Stretch)
+            header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
+            header.setSectionResizeMode(i, QHeaderView.Interactive)
+            header.setSectionResizeMode(i, QHeaderView.Fixed)
+            header.setDefaultAlignment(Qt.AlignCenter)
+            header.setFont(header_font)
+
+        # Set the widget that will be displayed inside the right_frame
+        self.right_frame.setWidget(self.tree)
+        self.right_frame.setWidgetResizable(True)
+
+        # Ensure consistent separation between columns
+        self.tree.setColumnWidth(0, 100)
+        self.tree.setColumnWidth(1, 170)
+        self.tree.setColumnWidth(2, 230)
+        self.tree.setColumnWidth(3, 130)
+        self.tree.setColumnWidth(4, 82)
+        self.tree.setColumnWidth(5, 110)
+        self.tree.setColumnWidth(6, 75)
+
+        # The table is populated by display_records once the database is connected
+
+
+    def setup_filter_frame(self):
+        # Filters run on the server against supporting indexes, so only matching rows are fetched
+        self.filter_name_entry = QLineEdit(self.filter_frame)
+        self.filter_name_entry.setFont(entryfont)
+        self.filter_name_entry.setPlaceholderText("Name starts with")
+        self.filter_name_entry.returnPressed.connect(self.apply_filter)
+        self.filter_name_entry.setGeometry(0, 0, 160, 30)
+
+        # Search as you type: the loaded rows are narrowed on every keystroke, but a query
+        # to the server waits until typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search)
+        self.filter_name_entry.textEdited.connect(self.name_edited)
+
+        self.filter_stream_entry = QLineEdit(self.filter_frame)
+        self.filter_stream_entry.setFont(entryfont)
+        self.filter_stream_entry.setPlaceholderText("Stream")
+        self.filter_stream_entry.returnPressed.connect(self.apply_filter)
+        self.filter_stream_entry.setGeometry(170, 0, 120, 30)
+
+        self.filter_gender_entry = QComboBox(self.filter_frame)
+        self.filter_gender_entry.setFont(entryfont)
+        self.filter_gender_entry.addItems(["Any gender", "Male", "Female"])
+        self.filter_gender_entry.setGeometry(300, 0, 135, 30)
+
+        # The minimum date stands for "no bound" and shows the placeholder text instead
+        self.filter_dob_from = QDateEdit(self.filter_frame)
+        self.filter_dob_from.setFont(entryfont)
+        self.filter_dob_from.setDisplayFormat("yyyy-MM-dd")
+        self.filter_dob_from.setSpecialValueText("DOB from")
+        self.filter_dob_from.setGeometry(445, 0, 125, 30)
+
+        self.filter_dob_to = QDateEdit(self.filter_frame)
+        self.filter_dob_to.setFont(entryfont)
+        self.filter_dob_to.setDisplayFormat("yyyy-MM-dd")
+        self.filter_dob_to.setSpecialValueText("DOB to")
+        self.filter_dob_to.setGeometry(580, 0, 125, 30)
+
+        self.button_filter = QPushButton("Filter", self.filter_frame)
+        self.button_filter.setFont(entryfont)
+        self.button_filter.clicked.connect(self.apply_filter)
+        self.button_filter.setGeometry(715, 0, 60, 30)
+
+        self.button_clear_filter = QPushButton("Clear", self.filter_frame)
+        self.button_clear_filter.setFont(entryfont)
+        self.button_clear_filter.clicked.connect(self.clear_filter)
+        self.button_clear_filter.setGeometry(785, 0, 60, 30)
+
+        self.button_query_plan = QPushButton("Plan", self.filter_frame)
+        self.button_query_plan.setFont(entryfont)
+        self.button_query_plan.setToolTip("Show how the database answers the current filter")
+        self.button_query_plan.clicked.connect(self.show_query_plan)
+        self.button_query_plan.setGeometry(850, 0, 60, 30)
+
+        for entry in (self.filter_dob_from, self.filter_dob_to):
+            entry.setDate(entry.minimumDate())
+
+        self.active_filter = StudentFilter()
+
+
+    def current_filter(self):
+        def dob_bound(entry):
+            return '' if entry.date() == entry.minimumDate() else entry.date().toString(Qt.ISODate)
+
+        return StudentFilter(
+            name_prefix=self.filter_name_entry.text().strip(),
+            stream=self.filter_stream_entry.text().strip(),
+            gender=self.filter_gender_entry.currentText() if self.filter_gender_entry.currentIndex() > 0 else '',
+            dob_from=dob_bound(self.filter_dob_from),
+            dob_to=dob_bound(self.filter_dob_to))
+
+
+    def apply_filter(self):
+        self.search_timer.stop()
+        self.active_filter = self.current_filter()
+        self.first_page()
+
+
+    def name_edited(self, text):
+        if self.narrow_loaded(self.current_filter()):
+            self.search_timer.stop()
+        else:
+            self.search_timer.start()
+
+
+    def search(self):
+        student_filter = self.current_filter()
+        if student_filter == self.active_filter or self.narrow_loaded(student_filter):
+            return
+        # Starting the new query resets the model, which discards the superseded one's results
+        # and closes its cursor; the timeout bounds any request still in flight
+        self.apply_filter()
+
+
+    def narrow_loaded(self, student_filter):
+        """Answers student_filter from the loaded rows when they hold every match; False if a query is needed."""
+        if not (student_filter.narrows(self.active_filter) and self.loaded_result_complete()):
+            return False
+        # A query still waiting on the timer, or in flight, would replace these rows
+        self.page_request += 1
+        self.active_filter = student_filter
+        self.model.set_records(record for record in self.model.records() if student_filter.matches(record))
+        return True
+
+
+    def loaded_result_complete(self):
+        if self.paged_view.isChecked():
+            # A page reached with Go to ID starts partway through the result, so it never holds every match
+            return self.page_loaded and self.page_cursors == [self.backend.first_page_cursor()] and self.next_page_cursor is None
+        return not self.model.canFetchMore()
+
+
+    def clear_filter(self):
+        self.filter_name_entry.clear()
+        self.filter_stream_entry.clear()
+        self.filter_gender_entry.setCurrentIndex(0)
+        for entry in (self.filter_dob_from, self.filter_dob_to):
+            entry.setDate(entry.minimumDate())
+        self.apply_filter()
+
+
+    def show_plan(self, plan):
+        QMessageBox.information(self, 'Query plan', plan)
+
+
+    def setup_page_frame(self):
+        # Paged browsing: every page is one bounded query, however large the collection grows
+        self.paged_view = QCheckBox("Paged view", self.page_frame)
+        self.paged_view.setFont(entryfont)
+        self.paged_view.setGeometry(0, 0, 130, 30)
+        self.paged_view.toggled.connect(self.first_page)
+
+        label_page_size = QLabel("Page size", self.page_frame)
+        label_page_size.setFont(entryfont)
+        label_page_size.setGeometry(140, 0, 80, 30)
+
+        self.page_size_entry = QComboBox(self.page_frame)
+        self.page_size_entry.setFont(entryfont)
+        self.page_size_entry.addItems(["50", "100", "200", "500"])
+        self.page_size_entry.setCurrentText("100")
+        self.page_size_entry.setGeometry(225, 0, 70, 30)
+        self.page_size_entry.currentTextChanged.connect(self.first_page)
+
+        self.button_previous_page = QPushButton("Previous", self.page_frame)
+        self.button_previous_page.setFont(entryfont)
+        self.button_previous_page.clicked.connect(self.previous_page)
+        self.button_previous_page.setGeometry(310, 0, 100, 30)
+
+        self.button_next_page = QPushButton("Next", self.page_frame)
+        self.button_next_page.setFont(entryfont)
+        self.button_next_page.clicked.connect(self.next_page)
+        self.button_next_page.setGeometry(420, 0, 100, 30)
+
+        self.page_label = QLabel("", self.page_frame)
+        self.page_label.setFont(entryfont)
+        self.page_label.setAlignment(Qt.AlignCenter)
+        self.page_label.setGeometry(530, 0, 110, 30)
+
+        label_jump = QLabel("Go to ID", self.page_frame)
+        label_jump.setFont(entryfont)
+        label_jump.setGeometry(650, 0, 75, 30)
+
+        self.jump_entry = QLineEdit(self.page_frame)
+        self.jump_entry.setFont(entryfont)
+        self.jump_entry.setValidator(QIntValidator(1, 2147483647))
+        self.jump_entry.returnPressed.connect(self.jump_to_id)
+        self.jump_entry.setGeometry(730, 0, 100, 30)
+
+        self.button_jump = QPushButton("Go", self.page_frame)
+        self.button_jump.setFont(entryfont)
+        self.button_jump.clicked.connect(self.jump_to_id)
+        self.button_jump.setGeometry(840, 0, 70, 30)
+
+        self.page_cursors = [self.backend.first_page_cursor()]  # Start cursor of every page up to the current one
+        self.next_page_cursor = None
+        self.page_request = 0
+        self.page_loaded = False  # Whether the grid holds the page of page_cursors[-1] for the active filter
+        self.update_page_controls(loading=False)
+
+
+    def display_records(self):
+        self.page_request += 1  # Discard any page still loading
+        if self.paged_view.isChecked():
+            self.load_page()  # Reload the current page
+            return
+        self.update_page_controls(loading=False)
+        self.model.set_source(self.backend.scroll_source(self.active_filter, self.model.batch_size))
+
+
+    def first_page(self):
+        self.page_cursors = [self.backend.first_page_cursor()]
+        self.next_page_cursor = None
+        self.display_records()
+
+
+    def next_page(self):
+        if self.next_page_cursor is not None:
+            self.page_cursors.append(self.next_page_cursor)
+            self.load_page()
+
+
+    def previous_page(self):
+        if len(self.page_cursors) > 1:
+            self.page_cursors.pop()
+            self.load_page()
+
+
+    def jump_to_id(self):
+        if not self.jump_entry.hasAcceptableInput():
+            QMessageBox.critical(self, 'Error!', 'Please enter a valid student ID.')
+            return
+        if not self.active_filter.is_empty() and not self.backend.jump_within_filter:
+            QMessageBox.critical(self, 'Error!', 'Go to ID is not available while a filter is applied. Clear the filter first.')
+            return
+
+        # Switch to paged view without loading the first page
+        self.paged_view.blockSignals(True)
+        self.paged_view.setChecked(True)
+        self.paged_view.blockSignals(False)
+
+        self.page_cursors = [self.backend.page_cursor_for_id(int(self.jump_entry.text()))]
+        self.page_request += 1
+        self.load_page()
+
+
+    def load_page(self):
+        request = self.page_request
+        self.page_loaded = False
+        self.update_page_controls(loading=True)
+        self.executor.submit(self.backend.fetch_page, self.active_filter, self.page_cursors[-1], int(self.page_size_entry.currentText()),
+                             on_result=lambda page: self.show_page(request, page),
+                             on_error=lambda error: self.page_failed(request, error))
+
+
+    def show_query_plan(self):
+        self.executor.submit(self.backend.explain_filter, self.current_filter(), int(self.page_size_entry.currentText()),
+                             on_result=self.show_plan)
+
+
+    def show_page(self, request, page):
+        if request != self.page_request:
+            return
+        records, self.next_page_cursor = page
+        self.model.set_records(records)
+        self.page_loaded = True
+        self.update_page_controls(loading=False)
+
+
+    def page_failed(self, request, error):
+        if request == self.page_request:
+            self.update_page_controls(loading=False)
+        self.show_job_error(error)
+
+
+    def update_page_controls(self, loading):
+        paged = self.paged_view.isChecked()
+        self.button_previous_page.setEnabled(paged and not loading and len(self.page_cursors) > 1)
+        self.button_next_page.setEnabled(paged and not loading and self.next_page_cursor is not None)
+        self.page_label.setText(f"Page {len(self.page_cursors)}" if paged else "")
+
+
+    def setup_status_bar(self):
+        # Busy indicator shown while database operations are running or queued
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumWidth(150)
+        self.busy_indicator.hide()
+        self.statusBar().addPermanentWidget(self.busy_indicator)
+        self.executor.pending_changed.connect(self.update_busy_indicator)
+
+        # Connection state, with a Retry button while the database cannot be reached
+        self.connection_label = QLabel()
+        self.statusBar().addPermanentWidget(self.connection_label)
+        self.button_retry_connect = QPushButton("Retry")
+        self.button_retry_connect.clicked.connect(self.connect_in_background)
+        self.button_retry_connect.hide()
+        self.statusBar().addPermanentWidget(self.button_retry_connect)
+
+        self.button_diagnostics = QPushButton("Diagnostics")
+        self.button_diagnostics.clicked.connect(self.show_diagnostics)
+        self.statusBar().addPermanentWidget(self.button_diagnostics)
+        self.import_progress.connect(self.show_import_progress)
+        self.export_progress.connect(self.show_export_progress)
+
+
+    def connect_in_background(self):
+        if self.connected or self.connecting:
+            return
+        self.connect_retry_timer.stop()
+        self.connecting = True
+        self.button_retry_connect.hide()
+        self.connection_label.setText("Connecting to the database...")
+        self.connection_label.setToolTip("")
+        self.executor.submit(self.backend.start, on_result=self.database_ready, on_error=self.connection_failed)
+
+
+    def database_ready(self, _):
+        self.connecting = False
+        self.connected = True
+        self.connection_label.setText("Connected")
+        self.set_database_actions_enabled(True)
+        self.display_records()
+
+
+    def connection_failed(self, error):
+        # Keep trying on a timer; Retry connects at once
+        self.connecting = False
+        self.connection_label.setText(f"Not connected, retrying in {CONNECT_RETRY_MS // 1000} s")
+        self.connection_label.setToolTip(str(error))
+        self.button_retry_connect.show()
+        self.connect_retry_timer.start()
+
+
+    def show_diagnostics(self):
+        DiagnosticsDialog(self.backend, self.connected, self).exec_()
+
+
+    def set_database_actions_enabled(self, enabled):
+        # Record buttons, the filter bar and paging need a connection; the form stays editable
+        for frame in (self.center_frame, self.filter_frame, self.page_frame):
+            frame.setEnabled(enabled)
+
+
+    def update_busy_indicator(self, pending):
+        self.busy_indicator.setVisible(pending > 0)
+        if pending:
+            self.statusBar().showMessage(f"Working... {pending} database operation(s) in progress")
+        else:
+            self.statusBar().clearMessage()
+
+
+    def show_job_error(self, error):
+        if isinstance(error, RecordError):
+            QMessageBox.critical(self, 'Error!', str(error))
+        else:
+            QMessageBox.critical(self, 'Error', f'An error occurred: {str(error)}')
+
+
+    def reset_fields(self):
+        self.name_entry.clear()
+        self.email_entry.clear()
+        self.contact_entry.clear()
+        self.gender_entry.setCurrentIndex(0)
+        self.dob_entry.setDate(QDate.currentDate())
+        self.stream_entry.clear()
+
+
+    def confirm_action(self, action, count=1):
+        target = 'this record' if count == 1 else f'these {count} records'
+        confirm = QMessageBox.question(self, "Confirmation", f'Are you sure you want to {action} {target}?',
+                                        QMessageBox.Yes | QMessageBox.No)
+        return confirm == QMessageBox.Yes
+
+
+    def is_valid_phone_number(self, phone):
+        return student_validation.is_valid_phone_number(phone)
+
+
+    def is_valid_email(self, email):
+        return student_validation.is_valid_email(email)
+
+
+    def add_record(self):
+        name = self.name_entry.text()
+        email = self.email_entry.text()
+        contact = self.contact_entry.text()
+        gender = self.gender_entry.currentText()
+        dob = self.dob_entry.date().toString(Qt.ISODate)
+        stream = self.stream_entry.text()
+
+        # Check if any field is empty
+        if not name or not email or not contact or not gender or not dob or not stream:
+            QMessageBox.critical(self, 'Error!', "Please fill all the missing fields!!")
+            return
+
+        # Validate email format
+        if not self.is_valid_email(email):
+            QMessageBox.critical(self, 'Error!', "Please enter a valid email address.")
+            return
+
+        # Validate phone number format
+        if not self.is_valid_phone_number(contact):
+            QMessageBox.critical(self, 'Error!', "Please enter a valid 10-digit phone number.")
+            return
+
+        # Create the new record
+        new_record = {
+            'name': name,
+            'email': email,
+            'phone_no': contact,
+            'gender': gender,
+            'dob': dob,
+            'stream': stream
+        }
+
+        # Check the email, assign an id and insert the record off the GUI thread
+        self.executor.submit(self.backend.insert_record, new_record, on_result=self.record_added)
+
+
+    def record_added(self, record):
+        QMessageBox.information(self, 'Record added', f"Record of {record['name']} was successfully added")
+        self.reset_fields()
+        if self.paged_view.isChecked():
+            # Whether the new id belongs on the page shown, and what it pushes off, is the page query's to say
+            self.display_records()
+        elif self.active_filter.matches(record):
+            self.model.append_record(record)  # Patch in the new row instead of reloading the table
+        self.check_consistency(record['id'])
+
+
+    def selected_record_ids(self):
+        # One id per selected row, taken from the model rather than parsed out of each cell's text
+        rows = sorted({index.row() for index in self.tree.selectedIndexes()})
+        return [self.model.record_at(row)['id'] for row in rows]
+
+
+    def remove_record(self):
+        selection = self.tree.selectedIndexes()
+        if not selection:
+            QMessageBox.critical(self, 'Error!', 'Please select a record to delete')
+            return
+
+        record_ids = self.selected_record_ids()
+        if not record_ids:
+            QMessageBox.critical(self, 'Error!', 'No valid record found to delete')
+            return
+
+        # Every selected record goes in one operation after a single confirmation
+        if self.confirm_action('delete', len(record_ids)):
+            self.executor.submit(self.backend.delete_records, record_ids, on_result=self.records_deleted)
+
+
+    def records_deleted(self, record_ids):
+        if len(record_ids) == 1:
+            QMessageBox.information(self, 'Done', 'Record Deleted Successfully')
+        else:
+            QMessageBox.information(self, 'Done', f'{len(record_ids)} Records Deleted Successfully')
+        self.model.remove_record_ids(record_ids)  # Drop only the deleted rows from the UI
+        for record_id in record_ids:
+            self.check_consistency(record_id)
+
+
+    def view_record(self):
+        selection = self.tree.selectedIndexes()
+        if not selection:
+            QMessageBox.critical(self, 'Error!', 'Please select a record to view')
+            return
+
+        # The form shows the last selected record, straight from the rows the grid has loaded;
+        # the database is only read for a record that is not loaded
+        record_id = self.selected_record_ids()[-1]
+        record = self.model.record_for_id(record_id)
+        if record is not None:
+            self.show_record(record)
+        else:
+            self.executor.submit(self.backend.find_record, record_id, on_result=self.show_record)
+
+
+    def show_record(self, record):
+        if record is None:
+            QMessageBox.critical(self, 'Error!', 'Record not found')
+            return
+
+        self.name_entry.setText(record['name'])
+        self.email_entry.setText(record['email'])
+        self.contact_entry.setText(record['phone_no'])
+        self.gender_entry.setCurrentText(record['gender'])
+        self.dob_entry.setDate(QDate.fromString(record['dob'], Qt.ISODate))
+        self.stream_entry.setText(record['stream'])
+
+
+    def update_record(self):
+        selection = self.tree.selectedIndexes()
+        if not selection:
+            QMessageBox.critical(self, 'Error!', 'Please select a record to update')
+            return
+
+        record_ids = self.selected_record_ids()
+        if not record_ids:
+            QMessageBox.critical(self, 'Error!', 'No valid record found to update')
+            return
+
+        if not self.confirm_action('update'):
+            return
+
+        current_id = record_ids[0]
+        name = self.name_entry.text()
+        email = self.email_entry.text()
+        contact = self.contact_entry.text()
+        gender = self.gender_entry.currentText()
+        dob = self.dob_entry.date().toString(Qt.ISODate)
+        stream = self.stream_entry.text()
+
+        if not name or not email or not contact or not gender or not dob or not stream:
+            QMessageBox.critical(self, 'Error!', "Please fill all the missing fields!!")
+            return
+
+        if not self.is_valid_email(email):
+            QMessageBox.critical(self, 'Error!', "Please enter a valid email address.")
+            return
+
+        if not self.is_valid_phone_number(contact):
+            QMessageBox.critical(self, 'Error!', "Please enter a valid 10-digit phone number.")
+            return
+
+        new_data = {
+            'name': name,
+            'email': email,
+            'phone_no': contact,
+            'gender': gender,
+            'dob': dob,
+            'stream': stream
+        }
+
+        # Write only the fields that differ from the record as loaded in the grid
+        original = self.model.record_for_id(current_id)
+        if original is None:
+            original, changes = {'id': current_id}, new_data
+        else:
+            changes = {field: value for field, value in new_data.items() if original[field] != value}
+        if not changes:
+            QMessageBox.information(self, 'Done', 'Nothing to update, the record is unchanged.')
+            return
+
+        self.executor.submit(self.backend.save_record, original, changes, on_result=self.record_updated)
+
+
+    def record_updated(self, record):
+        QMessageBox.information(self, 'Done', 'Record updated successfully.')
+        self.reset_fields()  # Clear input fields
+        if self.active_filter.matches(record):
+            self.model.replace_record(record)  # Repaint only the updated row
+        else:
+            self.model.remove_record_ids([record['id']])  # No longer matches the filter
+        self.check_consistency(record['id'])
+
+
+    def bulk_update(self):
+        dialog = BulkEditDialog(len(self.selected_record_ids()), self.active_filter.describe(), self)
+        if dialog.exec_() != BulkEditDialog.Accepted:
+            return
+        changes = dialog.changes()
+        if not changes:
+            QMessageBox.critical(self, 'Error!', "Please choose at least one field to set.")
+            return
+        if changes.get('stream') == '':
+            QMessageBox.critical(self, 'Error!', "Please fill all the missing fields!!")
+            return
+
+        # Dry run first: count the students the update would touch and ask before writing anything
+        record_ids = self.selected_record_ids() if dialog.use_selection() else None
+        self.executor.submit(self.backend.count_bulk_targets, record_ids, self.active_filter,
+                             on_result=lambda targets: self.confirm_bulk_update(targets, changes))
+
+
+    def confirm_bulk_update(self, targets, changes):
+        target, count = targets
+        if count == 0:
+            QMessageBox.information(self, 'Bulk Update', 'No students match, nothing to update.')
+            return
+        assignments = ", ".join(f"{field} = {value}" for field, value in changes.items())
+        confirm = QMessageBox.question(self, "Confirmation", f'Set {assignments} on {count} students?',
+                                       QMessageBox.Yes | QMessageBox.No)
+        if confirm == QMessageBox.Yes:
+            self.executor.submit(self.backend.apply_bulk_update, target, changes, on_result=self.bulk_updated)
+
+
+    def bulk_updated(self, count):
+        QMessageBox.information(self, 'Done', 'Record updated successfully.' if count == 1 else f'{count} records updated successfully.')
+        self.display_records()  # Updated rows may have left the filter, so reload what the grid shows
+
+
+    def check_consistency(self, record_id):
+        if self.verify_writes:
+            self.executor.submit(self.backend.find_record, record_id, on_result=lambda record: self.sync_row(record_id, record))
+
+
+    def sync_row(self, record_id, record):
+        if record is None or not self.active_filter.matches(record):
+            self.model.remove_record_ids([record_id])
+        elif self.paged_view.isChecked():
+            self.model.replace_record(record)  # A page only corrects rows it already shows
+        else:
+            self.model.append_record(record)
+
+
+
+    def import_records(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Records", "", "Student files (*.csv *.jsonl *.csv.gz *.jsonl.gz)")
+        if not path:
+            return
+
+        # Rows are streamed from the file and written in batches on a worker thread
+        writer = self.backend.student_writer()
+        self.executor.submit(import_students, path, writer, progress=self.import_progress.emit, on_result=self.records_imported)
+
+
+    def show_import_progress(self, report):
+        self.statusBar().showMessage(f"Importing... {report.inserted} rows imported, {report.rejected} rejected "
+                                     f"({report.rows_per_sec():.0f} rows/sec)")
+
+
+    def records_imported(self, report):
+        self.statusBar().clearMessage()
+        QMessageBox.information(self, 'Import finished', report.summary(max_rejects=10))
+        self.display_records()
+
+
+
+    def export_records(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Records", "students.csv", "Student files (*.csv *.jsonl *.csv.gz *.jsonl.gz)")
+        if not path:
+            return
+
+        # The backend's records stream straight into the file
+        self.executor.submit(lambda: export_students(self.backend.export_records(), path, progress=self.export_progress.emit),
+                             on_result=self.records_exported)
+
+
+    def show_export_progress(self, report):
+        self.statusBar().showMessage(f"Exporting... {report.written} rows written ({report.rows_per_sec():.0f} rows/sec)")
+
+
+    def records_exported(self, report):
+        self.statusBar().clearMessage()
+        QMessageBox.information(self, 'Export finished', report.summary())
+